@@ -1,46 +1,465 @@
-from abc import ABC, abstractmethod
-from typing import Optional, Dict
+import hashlib
+import hmac
+import os
+import sys
+import threading
+import time
+from abc import ABC
+from collections import Counter, OrderedDict, deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
+from typing import Callable, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Per-handler instrumentation
+class HandlerStats:
+    """Pass/reject counts, rejection reasons and a log2 latency histogram in nanoseconds"""
+    def __init__(self):
+        self.passed = 0
+        self.rejected = 0
+        self.reasons: Counter = Counter()
+        self.total_ns = 0
+        # Bucket b counts checks that took [2**(b-1), 2**b) ns
+        self.histogram = [0] * 64
+    
+    @property
+    def calls(self) -> int:
+        return self.passed + self.rejected
+    
+    @property
+    def mean_ns(self) -> float:
+        return self.total_ns / self.calls if self.calls else 0.0
+    
+    @property
+    def reject_rate(self) -> float:
+        return self.rejected / self.calls if self.calls else 0.0
+    
+    def record(self, elapsed_ns: int, rejection: Optional[str]) -> None:
+        self.total_ns += elapsed_ns
+        self.histogram[min(elapsed_ns.bit_length(), 63)] += 1
+        if rejection is None:
+            self.passed += 1
+        else:
+            self.rejected += 1
+            self.reasons[rejection] += 1
+    
+    def record_batch(self, elapsed_ns: int, rejections: List[Optional[str]]) -> None:
+        """Record a chunk; every request is charged the chunk's average latency"""
+        if not rejections:
+            return
+        self.total_ns += elapsed_ns
+        self.histogram[min((elapsed_ns // len(rejections)).bit_length(), 63)] += len(rejections)
+        for rejection in rejections:
+            if rejection is None:
+                self.passed += 1
+            else:
+                self.rejected += 1
+                self.reasons[rejection] += 1
+    
+    def percentile(self, p: float) -> int:
+        """Upper bound in ns of the bucket holding the p-th percentile"""
+        target = p / 100 * self.calls
+        seen = 0
+        for bucket, count in enumerate(self.histogram):
+            seen += count
+            if count and seen >= target:
+                return 1 << bucket
+        return 0
+    
+    def summary(self) -> str:
+        return (f"{self.calls} calls, {self.passed} passed, {self.rejected} rejected, "
+                f"mean {self.mean_ns:.0f}ns, p50 <{self.percentile(50)}ns, p99 <{self.percentile(99)}ns")
 
 # Handler interface
 class Handler(ABC):
+    # Result when this handler is the last one and the request passes
+    success_message = "Request handled"
+    # Handlers whose checks may run in any order relative to their
+    # order-independent neighbours; only these are moved by adaptive chains
+    order_independent = False
+    # Instrumentation is off while this is None, costing one attribute check
+    stats: Optional[HandlerStats] = None
+    
     def __init__(self):
+        if type(self).handle is Handler.handle and type(self).check is Handler.check:
+            raise TypeError(f"{type(self).__name__} must override handle() or check()")
         self._next_handler: Optional[Handler] = None
     
     def set_next(self, handler: 'Handler') -> 'Handler':
         self._next_handler = handler
         return handler
     
-    @abstractmethod
+    def check(self, request: Dict) -> Optional[str]:
+        """
+        Return a rejection message, or None to pass the request on. Optional:
+        handlers may override handle() instead, but only handlers that
+        implement check() can be compiled or batched.
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not implement check()")
+    
+    def check_batch(self, requests: List[Dict]) -> List[Optional[str]]:
+        """check() for a whole chunk; handlers can override this with a faster version"""
+        return list(map(self.check, requests))
+    
+    def enable_instrumentation(self) -> HandlerStats:
+        self.stats = HandlerStats()
+        return self.stats
+    
+    def disable_instrumentation(self) -> None:
+        self.stats = None
+    
+    def _timed_check(self, request: Dict) -> Optional[str]:
+        start = time.perf_counter_ns()
+        rejection = self.check(request)
+        self.stats.record(time.perf_counter_ns() - start, rejection)
+        return rejection
+    
+    def _timed_check_batch(self, requests: List[Dict]) -> List[Optional[str]]:
+        start = time.perf_counter_ns()
+        rejections = self.check_batch(requests)
+        self.stats.record_batch(time.perf_counter_ns() - start, rejections)
+        return rejections
+    
+    def handle(self, request: Dict) -> str:
+        """Process the request or pass it to the next handler; the default runs check()"""
+        rejection = self.check(request) if self.stats is None else self._timed_check(request)
+        if rejection is not None:
+            return rejection
+        if self._next_handler:
+            return self._next_handler.handle(request)
+        return self.success_message
+    
+    def compile(self) -> 'CompiledChain':
+        """Flatten the chain starting here into a loop-driven pipeline"""
+        return CompiledChain(self)
+    
+    def handle_batch(self, requests: Iterable[Dict], chunk_size: int = 4096,
+                     processes: Optional[int] = None) -> Iterator[str]:
+        return self.compile().handle_batch(requests, chunk_size, processes)
+
+# Compiled chain - runs the same handlers in a loop instead of recursing
+class CompiledChain:
+    """
+    Instrumentation is picked up when the chain is compiled. With adaptive
+    set, order-independent handlers are instrumented and each run of adjacent
+    order-independent handlers is periodically re-sorted so the cheapest,
+    most frequently rejecting checks run first (ascending mean cost divided by
+    reject rate). If several of those handlers would reject the same request,
+    the message returned may then come from a different one of them.
+    
+    Enabling instrumentation changes the handler objects themselves, so their
+    own recursive handle() is timed too while it stays on. close() turns it
+    back off on the handlers this chain instrumented.
+    """
+    def __init__(self, head: Handler, adaptive: bool = False, reorder_every: int = 10_000):
+        handlers: List[Handler] = []
+        seen = set()
+        node: Optional[Handler] = head
+        while node is not None:
+            if id(node) in seen:
+                raise ValueError("Handler chain contains a cycle")
+            if type(node).handle is not Handler.handle:
+                raise ValueError(f"{type(node).__name__} overrides handle() and cannot be compiled")
+            if type(node).check is Handler.check:
+                raise TypeError(f"{type(node).__name__} does not implement check() and cannot be compiled")
+            seen.add(id(node))
+            handlers.append(node)
+            node = node._next_handler
+        self._success = handlers[-1].success_message
+        self._adaptive = adaptive
+        self._reorder_every = reorder_every
+        self._until_reorder = reorder_every
+        # Handlers instrumented by this chain rather than by the caller
+        self._instrumented: List[Handler] = []
+        if adaptive:
+            # Only the handlers that may move need measuring
+            for handler in handlers:
+                if handler.order_independent and handler.stats is None:
+                    handler.enable_instrumentation()
+                    self._instrumented.append(handler)
+        self._set_handlers(handlers)
+    
+    def _set_handlers(self, handlers: List[Handler]) -> None:
+        self._handlers = tuple(handlers)
+        # Bound methods are looked up once here rather than on every request
+        self._checks: Tuple[Callable[[Dict], Optional[str]], ...] = tuple(
+            h.check if h.stats is None else h._timed_check for h in handlers)
+    
+    def __len__(self) -> int:
+        return len(self._handlers)
+    
+    @property
+    def handlers(self) -> Tuple[Handler, ...]:
+        return self._handlers
+    
     def handle(self, request: Dict) -> str:
-        pass
+        if self._adaptive:
+            self._until_reorder -= 1
+            if self._until_reorder <= 0:
+                self.reorder()
+        for check in self._checks:
+            rejection = check(request)
+            if rejection is not None:
+                return rejection
+        return self._success
+    
+    def reorder(self) -> None:
+        """Re-sort each run of adjacent order-independent handlers by cost per rejection"""
+        self._until_reorder = self._reorder_every
+        handlers = list(self._handlers)
+        start = 0
+        while start < len(handlers):
+            if not handlers[start].order_independent:
+                start += 1
+                continue
+            end = start
+            while end < len(handlers) and handlers[end].order_independent:
+                end += 1
+            handlers[start:end] = sorted(handlers[start:end], key=_cost_per_rejection)
+            start = end
+        self._set_handlers(handlers)
+    
+    def close(self) -> None:
+        """Turn off the instrumentation this chain enabled; the chain stops adapting"""
+        for handler in self._instrumented:
+            handler.disable_instrumentation()
+        self._instrumented = []
+        self._adaptive = False
+        self._set_handlers(list(self._handlers))
+    
+    def report(self) -> str:
+        return "\n".join(f"{type(h).__name__}: {h.stats.summary() if h.stats else 'not instrumented'}"
+                         for h in self._handlers)
+    
+    def handle_chunk(self, requests: List[Dict]) -> List[str]:
+        """
+        Run a chunk through the chain one handler at a time. Each handler only
+        sees the requests that every earlier handler passed.
+        """
+        results: List[Optional[str]] = [None] * len(requests)
+        pending = list(range(len(requests)))
+        for handler in self._handlers:
+            if not pending:
+                break
+            batch = [requests[i] for i in pending]
+            rejections = handler.check_batch(batch) if handler.stats is None else handler._timed_check_batch(batch)
+            passed = []
+            for index, rejection in zip(pending, rejections):
+                if rejection is None:
+                    passed.append(index)
+                else:
+                    results[index] = rejection
+            pending = passed
+        for index in pending:
+            results[index] = self._success
+        return results
+    
+    def handle_batch(self, requests: Iterable[Dict], chunk_size: int = 4096,
+                     processes: Optional[int] = None) -> Iterator[str]:
+        """
+        Yield one result per request, in order. With processes set, chunks are
+        spread over a process pool with a bounded number in flight, so huge
+        inputs are streamed rather than loaded all at once.
+        """
+        requests = iter(requests)
+        chunks = iter(lambda: list(islice(requests, chunk_size)), [])
+        if not processes:
+            for chunk in chunks:
+                yield from self.handle_chunk(chunk)
+            return
+        
+        with ProcessPoolExecutor(processes, initializer=_init_worker, initargs=(self,)) as pool:
+            in_flight: Deque[Future] = deque()
+            for chunk in chunks:
+                in_flight.append(pool.submit(_handle_chunk_in_worker, chunk))
+                if len(in_flight) >= 2 * processes:
+                    yield from in_flight.popleft().result()
+            while in_flight:
+                yield from in_flight.popleft().result()
+
+def _cost_per_rejection(handler: Handler) -> float:
+    stats = handler.stats
+    if stats is None or not stats.calls:
+        return 0.0
+    return stats.mean_ns / max(stats.reject_rate, 1e-9)
+
+# Process pool workers receive the chain once and reuse it for every chunk
+_worker_chain: Optional[CompiledChain] = None
+
+def _init_worker(chain: CompiledChain) -> None:
+    global _worker_chain
+    _worker_chain = chain
+
+def _handle_chunk_in_worker(requests: List[Dict]) -> List[str]:
+    return _worker_chain.handle_chunk(requests)
+
+# Credential store - stands in for the real user database
+class CredentialStore:
+    """Keeps salted PBKDF2 digests and compares them in constant time"""
+    def __init__(self, users: Dict[str, str], iterations: int = 10_000):
+        self._iterations = iterations
+        self._users: Dict[str, Tuple[bytes, bytes]] = {}
+        for username, password in users.items():
+            self.set_password(username, password)
+    
+    def set_password(self, username: str, password: str) -> None:
+        salt = os.urandom(16)
+        self._users[username] = (salt, self._digest(password, salt))
+    
+    def _digest(self, password: str, salt: bytes) -> bytes:
+        # surrogatepass: lone surrogates (which json.loads can produce) hash instead of raising
+        return hashlib.pbkdf2_hmac("sha256", password.encode("utf-8", "surrogatepass"), salt, self._iterations)
+    
+    def verify(self, username: str, password: str) -> bool:
+        salt, expected = self._users.get(username, (b"\0" * 16, b""))
+        # Unknown users still pay for a digest so timing does not reveal who exists
+        return hmac.compare_digest(self._digest(password, salt), expected)
+
+class SlowCredentialStore(CredentialStore):
+    """Credential store with simulated network latency, for benchmarks"""
+    def __init__(self, users: Dict[str, str], delay: float = 0.005, iterations: int = 10_000):
+        super().__init__(users, iterations)
+        self._delay = delay
+    
+    def verify(self, username: str, password: str) -> bool:
+        time.sleep(self._delay)
+        return super().verify(username, password)
+
+# Authentication cache - LRU with time-to-live, keyed by a salted hash of the credentials
+class AuthenticationCache:
+    def __init__(self, max_entries: int = 10_000, ttl: float = 300.0, negative_ttl: float = 30.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self._max_entries = max_entries
+        self._ttl = ttl
+        self._negative_ttl = negative_ttl
+        self._clock = clock
+        self._reset()
+    
+    def _reset(self) -> None:
+        # Per-process secret; plaintext passwords never become cache keys
+        self._secret = os.urandom(32)
+        # key -> (outcome, expiry, username); the username lets evictions prune _keys_by_user
+        self._entries: "OrderedDict[bytes, Tuple[bool, float, str]]" = OrderedDict()
+        self._keys_by_user: Dict[str, set] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    def __getstate__(self) -> Dict:
+        # Locks and secrets are not shared; a copy in another process starts empty
+        return {"_max_entries": self._max_entries, "_ttl": self._ttl,
+                "_negative_ttl": self._negative_ttl, "_clock": self._clock}
+    
+    def __setstate__(self, state: Dict) -> None:
+        self.__dict__.update(state)
+        self._reset()
+    
+    def key(self, username: str, password: str) -> bytes:
+        # The username is length-prefixed so no two credential pairs share a message
+        user = username.encode("utf-8", "surrogatepass")
+        message = len(user).to_bytes(8, "big") + user + password.encode("utf-8", "surrogatepass")
+        return hmac.new(self._secret, message, hashlib.sha256).digest()
+    
+    def get(self, key: bytes) -> Optional[bool]:
+        """Cached outcome for key, or None on a miss"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] <= self._clock():
+                if entry is not None:
+                    del self._entries[key]
+                    self._unindex(entry[2], key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+    
+    def put(self, username: str, key: bytes, outcome: bool) -> None:
+        if self._max_entries <= 0:
+            return
+        ttl = self._ttl if outcome else self._negative_ttl
+        with self._lock:
+            self._entries[key] = (outcome, self._clock() + ttl, username)
+            self._entries.move_to_end(key)
+            self._keys_by_user.setdefault(username, set()).add(key)
+            while len(self._entries) > self._max_entries:
+                evicted, (_, _, evicted_user) = self._entries.popitem(last=False)
+                self._unindex(evicted_user, evicted)
+    
+    def _unindex(self, username: str, key: bytes) -> None:
+        """Drop key from the user's index entry, and the entry itself once empty; caller holds the lock"""
+        keys = self._keys_by_user.get(username)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_user[username]
+    
+    def invalidate(self, username: str) -> None:
+        """Forget every cached outcome for a user, e.g. after a password change"""
+        with self._lock:
+            for key in self._keys_by_user.pop(username, ()):
+                self._entries.pop(key, None)
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_user.clear()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+
+DEFAULT_CREDENTIALS = CredentialStore({"admin": "password"})
 
 # Concrete handlers
 class AuthenticationHandler(Handler):
-    def handle(self, request: Dict) -> str:
+    success_message = "Authentication successful"
+    
+    def __init__(self, store: Optional[CredentialStore] = None, cache: Optional[AuthenticationCache] = None):
+        super().__init__()
+        self._store = store or DEFAULT_CREDENTIALS
+        self._cache = cache if cache is not None else AuthenticationCache()
+    
+    @property
+    def cache(self) -> AuthenticationCache:
+        return self._cache
+    
+    def check(self, request: Dict) -> Optional[str]:
         if "username" not in request or "password" not in request:
             return "Authentication failed: Missing credentials"
         
-        if request["username"] == "admin" and request["password"] == "password":
-            if self._next_handler:
-                return self._next_handler.handle(request)
-            return "Authentication successful"
+        # Checked before hashing: only strings can be encoded into a cache key
+        if not isinstance(request["username"], str) or not isinstance(request["password"], str):
+            return "Authentication failed: Invalid credentials"
+        
+        if self._authenticate(request["username"], request["password"]):
+            return None
         
         return "Authentication failed: Invalid credentials"
+    
+    def _authenticate(self, username: str, password: str) -> bool:
+        key = self._cache.key(username, password)
+        outcome = self._cache.get(key)
+        if outcome is None:
+            outcome = self._store.verify(username, password)
+            self._cache.put(username, key, outcome)
+        return outcome
 
 class AuthorizationHandler(Handler):
-    def handle(self, request: Dict) -> str:
+    success_message = "Authorization successful"
+    
+    def check(self, request: Dict) -> Optional[str]:
         if "role" not in request:
             return "Authorization failed: Missing role"
         
         if request["role"] in ["admin", "manager"]:
-            if self._next_handler:
-                return self._next_handler.handle(request)
-            return "Authorization successful"
+            return None
         
         return "Authorization failed: Insufficient privileges"
 
 class ValidationHandler(Handler):
-    def handle(self, request: Dict) -> str:
+    success_message = "Validation successful"
+    order_independent = True
+    
+    def check(self, request: Dict) -> Optional[str]:
         if "data" not in request:
             return "Validation failed: Missing data"
         
@@ -48,12 +467,142 @@ class ValidationHandler(Handler):
         if not isinstance(data, str) or len(data) < 1:
             return "Validation failed: Invalid data format"
         
-        if self._next_handler:
-            return self._next_handler.handle(request)
-        return "Validation successful"
+        return None
+    
+    def check_batch(self, requests: List[Dict]) -> List[Optional[str]]:
+        # Same rules as check(), inlined into one pass over the chunk
+        missing = "Validation failed: Missing data"
+        invalid = "Validation failed: Invalid data format"
+        return [missing if "data" not in request
+                else None if isinstance(request["data"], str) and request["data"]
+                else invalid
+                for request in requests]
+
+class PayloadSizeHandler(Handler):
+    """Rejects requests whose data is larger than max_length characters"""
+    success_message = "Payload size accepted"
+    order_independent = True
+    
+    def __init__(self, max_length: int = 1024):
+        super().__init__()
+        self._max_length = max_length
+    
+    def check(self, request: Dict) -> Optional[str]:
+        data = request.get("data")
+        if isinstance(data, str) and len(data) > self._max_length:
+            return "Validation failed: Payload too large"
+        return None
+
+# Benchmark
+def build_chain(length: int) -> Handler:
+    # One shared cache so every authentication step after the first is a hit
+    cache = AuthenticationCache()
+    kinds = [lambda: AuthenticationHandler(cache=cache), AuthorizationHandler, ValidationHandler]
+    head = kinds[0]()
+    tail = head
+    for i in range(1, length):
+        tail = tail.set_next(kinds[i % len(kinds)]())
+    return head
+
+def benchmark(lengths: Tuple[int, ...] = (3, 100, 10_000), requests: int = 200_000) -> None:
+    request = {"username": "admin", "password": "password", "role": "admin", "data": "some valid data"}
+    for length in lengths:
+        head = build_chain(length)
+        compiled = head.compile()
+        runs = max(1, requests // length)
+        
+        start = time.perf_counter()
+        for _ in range(runs):
+            compiled.handle(request)
+        compiled_time = (time.perf_counter() - start) / runs
+        
+        try:
+            start = time.perf_counter()
+            for _ in range(runs):
+                head.handle(request)
+            recursive = f"{(time.perf_counter() - start) / runs * 1e6:10.1f}us"
+        except RecursionError:
+            recursive = "RecursionError"
+        print(f"{length:>6} handlers: recursive {recursive:>14}, compiled {compiled_time * 1e6:10.1f}us")
+
+def benchmark_batch(count: int = 1_000_000, process_counts: Tuple[int, ...] = (2, 4)) -> None:
+    head = build_chain(3)
+    samples = [
+        {"username": "admin", "password": "password", "role": "admin", "data": "some valid data"},
+        {"username": "admin", "password": "wrong", "role": "admin", "data": "some valid data"},
+        {"username": "admin", "password": "password", "role": "user", "data": "some valid data"},
+        {"username": "admin", "password": "password", "role": "admin", "data": ""},
+    ]
+    requests = [samples[i % len(samples)] for i in range(count)]
+    
+    start = time.perf_counter()
+    expected = [head.handle(request) for request in requests]
+    print(f"handle() one at a time: {count / (time.perf_counter() - start):12,.0f} requests/s")
+    
+    start = time.perf_counter()
+    results = list(head.handle_batch(requests))
+    print(f"handle_batch():         {count / (time.perf_counter() - start):12,.0f} requests/s")
+    assert results == expected
+    
+    for processes in process_counts:
+        start = time.perf_counter()
+        results = list(head.handle_batch(requests, chunk_size=16384, processes=processes))
+        print(f"handle_batch({processes} procs):  {count / (time.perf_counter() - start):12,.0f} requests/s")
+        assert results == expected
+
+def benchmark_auth_cache(requests: int = 2000, users: int = 50) -> None:
+    passwords = {f"user{i}": f"secret{i}" for i in range(users)}
+    store = SlowCredentialStore(passwords)
+    attempts = [{"username": f"user{i % users}",
+                 "password": f"secret{i % users}" if i % 10 else "wrong"}
+                for i in range(requests)]
+    
+    for label, cache in (("no cache", AuthenticationCache(max_entries=0)), ("LRU+TTL cache", AuthenticationCache())):
+        handler = AuthenticationHandler(store, cache)
+        start = time.perf_counter()
+        for request in attempts:
+            handler.check(request)
+        elapsed = time.perf_counter() - start
+        print(f"{label:>14}: {elapsed / requests * 1e6:9.1f}us per request "
+              f"(hits {cache.hits}, misses {cache.misses})")
+
+def benchmark_adaptive(requests: int = 200_000) -> None:
+    class SlowValidationHandler(ValidationHandler):
+        """A data check that is rarely decisive but expensive"""
+        def check(self, request: Dict) -> Optional[str]:
+            sum(range(1000))
+            return super().check(request)
+    
+    samples = [{"username": "admin", "password": "password", "role": "admin",
+                "data": "x" * (2000 if i % 2 else 10)} for i in range(4)]
+    traffic = [samples[i % len(samples)] for i in range(requests)]
+    
+    for adaptive in (False, True):
+        head = AuthenticationHandler()
+        head.set_next(AuthorizationHandler()).set_next(SlowValidationHandler()).set_next(PayloadSizeHandler())
+        chain = CompiledChain(head, adaptive=adaptive, reorder_every=1000)
+        start = time.perf_counter()
+        for request in traffic:
+            chain.handle(request)
+        elapsed = time.perf_counter() - start
+        order = " -> ".join(type(h).__name__ for h in chain.handlers)
+        print(f"adaptive={adaptive!s:5}: {requests / elapsed:10,.0f} requests/s, order {order}")
+    print(chain.report())
+    chain.close()
 
 # Client code
 def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "--benchmark":
+        if len(sys.argv) > 2 and sys.argv[2] == "batch":
+            benchmark_batch()
+        elif len(sys.argv) > 2 and sys.argv[2] == "auth":
+            benchmark_auth_cache()
+        elif len(sys.argv) > 2 and sys.argv[2] == "adaptive":
+            benchmark_adaptive()
+        else:
+            benchmark()
+        return
+    
     # Create handlers
     authentication = AuthenticationHandler()
     authorization = AuthorizationHandler()
@@ -101,6 +650,24 @@ def main():
     }
     print("\nProcessing request with invalid data:")
     print(authentication.handle(invalid_data_request))
+    
+    # The same chain flattened into a loop gives the same answers;
+    # instrumentation is enabled first so the compiled chain records it
+    for handler in (authentication, authorization, validation):
+        handler.enable_instrumentation()
+    compiled = authentication.compile()
+    print("\nProcessing the same requests with the compiled chain:")
+    for request in (valid_request, invalid_auth_request, invalid_role_request, invalid_data_request):
+        print(compiled.handle(request))
+    
+    # Many requests at once, results streamed back in order
+    print("\nProcessing all four requests as one batch:")
+    batch = [valid_request, invalid_auth_request, invalid_role_request, invalid_data_request]
+    for result in authentication.handle_batch(batch, chunk_size=2):
+        print(result)
+    
+    print("\nPer-handler statistics:")
+    print(compiled.report())
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -0,0 +1,196 @@
+import asyncio
+import json
+import sys
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from chain_of_responsibility import (AuthenticationHandler, AuthorizationHandler,
+                                     Handler, ValidationHandler)
+
+# Async handler interface
+class AsyncHandler(ABC):
+    success_message = "Request handled"
+
+    def __init__(self):
+        self._next_handler: Optional[AsyncHandler] = None
+
+    def set_next(self, handler: 'AsyncHandler') -> 'AsyncHandler':
+        self._next_handler = handler
+        return handler
+
+    @abstractmethod
+    async def check(self, request: Dict) -> Optional[str]:
+        """Return a rejection message, or None to pass the request on"""
+        pass
+
+    async def handle(self, request: Dict) -> str:
+        rejection = await self.check(request)
+        if rejection is not None:
+            return rejection
+        if self._next_handler:
+            return await self._next_handler.handle(request)
+        return self.success_message
+
+# Adapter - lets a synchronous Handler's check run inside an async chain
+class HandlerAdapter(AsyncHandler):
+    """
+    latency simulates the I/O a real check would wait on (user store, policy
+    service). blocking=True runs the check in a worker thread, for checks
+    that do CPU or blocking work and would otherwise stall the event loop.
+    """
+    def __init__(self, handler: Handler, latency: float = 0.0, blocking: bool = False):
+        if type(handler).check is Handler.check:
+            raise TypeError(f"{type(handler).__name__} does not implement check() and cannot be adapted")
+        super().__init__()
+        self._handler = handler
+        self._latency = latency
+        self._blocking = blocking
+        self.success_message = handler.success_message
+
+    async def check(self, request: Dict) -> Optional[str]:
+        if self._latency:
+            await asyncio.sleep(self._latency)
+        if self._blocking:
+            return await asyncio.to_thread(self._handler.check, request)
+        return self._handler.check(request)
+
+# Composite step - independent checks run concurrently
+class ParallelHandler(AsyncHandler):
+    """
+    Runs independent checks together with asyncio.gather. If several reject,
+    the first in declaration order wins, so results do not depend on timing.
+    """
+    def __init__(self, handlers: Sequence[AsyncHandler]):
+        super().__init__()
+        self._handlers = tuple(handlers)
+        self.success_message = self._handlers[-1].success_message
+
+    async def check(self, request: Dict) -> Optional[str]:
+        rejections = await asyncio.gather(*(handler.check(request) for handler in self._handlers))
+        return next((rejection for rejection in rejections if rejection is not None), None)
+
+# Chain server - newline-delimited JSON over a local TCP socket
+class ChainServer:
+    def __init__(self, chain: AsyncHandler, host: str = "127.0.0.1", port: int = 0):
+        self._chain = chain
+        self._host = host
+        self._port = port
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._serve, self._host, self._port, limit=1 << 20)
+
+    async def close(self) -> None:
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    # Longer than the stream limit; the rest of the line cannot be framed, so hang up
+                    writer.write(json.dumps({"result": "Bad request: line too long"}).encode() + b"\n")
+                    await writer.drain()
+                    writer.write_eof()
+                    # Closing with unread input would reset the connection and lose the reply
+                    try:
+                        await asyncio.wait_for(self._discard(reader), 1.0)
+                    except asyncio.TimeoutError:
+                        pass
+                    break
+                if not line:
+                    break
+                try:
+                    result = await self._chain.handle(json.loads(line))
+                except (ValueError, TypeError) as error:
+                    result = f"Bad request: {error}"
+                writer.write(json.dumps({"result": result}).encode() + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _discard(reader: asyncio.StreamReader) -> None:
+        while await reader.read(1 << 16):
+            pass
+
+# Client and load generator
+async def send_requests(host: str, port: int, requests: List[Dict]) -> Tuple[List[str], List[float]]:
+    """Send requests one after another on one connection; return results and latencies"""
+    reader, writer = await asyncio.open_connection(host, port)
+    results, latencies = [], []
+    try:
+        for request in requests:
+            start = time.perf_counter()
+            writer.write(json.dumps(request).encode() + b"\n")
+            await writer.drain()
+            results.append(json.loads(await reader.readline())["result"])
+            latencies.append(time.perf_counter() - start)
+    finally:
+        writer.close()
+        await writer.wait_closed()
+    return results, latencies
+
+def percentile(sorted_values: List[float], p: float) -> float:
+    return sorted_values[min(len(sorted_values) - 1, int(p / 100 * len(sorted_values)))]
+
+async def run_load(host: str, port: int, concurrency: int, requests_per_client: int) -> None:
+    request = {"username": "admin", "password": "password", "role": "admin", "data": "some valid data"}
+    start = time.perf_counter()
+    runs = await asyncio.gather(*(send_requests(host, port, [request] * requests_per_client)
+                                  for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    latencies = sorted(latency for _, client_latencies in runs for latency in client_latencies)
+    print(f"concurrency {concurrency:>4}: {len(latencies) / elapsed:9,.0f} req/s, "
+          f"p50 {percentile(latencies, 50) * 1000:7.2f}ms, p99 {percentile(latencies, 99) * 1000:7.2f}ms")
+
+def build_chain(io_latency: float = 0.002) -> AsyncHandler:
+    """Authentication first, then authorization and validation checked concurrently"""
+    authentication = HandlerAdapter(AuthenticationHandler(), latency=io_latency, blocking=True)
+    authentication.set_next(ParallelHandler([
+        HandlerAdapter(AuthorizationHandler(), latency=io_latency),
+        HandlerAdapter(ValidationHandler()),
+    ]))
+    return authentication
+
+async def benchmark(levels: Tuple[int, ...] = (1, 10, 100, 500), total_requests: int = 5000) -> None:
+    server = ChainServer(build_chain())
+    await server.start()
+    host, port = server.address
+    for concurrency in levels:
+        await run_load(host, port, concurrency, max(1, total_requests // concurrency))
+    await server.close()
+
+# Client code
+async def demo() -> None:
+    server = ChainServer(build_chain())
+    await server.start()
+    host, port = server.address
+    requests = [
+        {"username": "admin", "password": "password", "role": "admin", "data": "some valid data"},
+        {"username": "admin", "password": "wrong", "role": "admin", "data": "some valid data"},
+        {"username": "admin", "password": "password", "role": "user", "data": "some valid data"},
+        {"username": "admin", "password": "password", "role": "admin", "data": ""},
+    ]
+    results, _ = await send_requests(host, port, requests)
+    for result in results:
+        print(result)
+    await server.close()
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "--benchmark":
+        asyncio.run(benchmark())
+        return
+    asyncio.run(demo())
+
+if __name__ == "__main__":
+    main()
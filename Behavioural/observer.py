@@ -1,5 +1,21 @@
+import asyncio
+import inspect
+import math
+import sys
+import threading
+import time
 from abc import ABC, abstractmethod
-from typing import List
+from array import array
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from itertools import repeat
+from operator import mul, sub
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Tuple
+
+Measurements = Tuple[float, float, float]
+FIELDS = ("temperature", "humidity", "pressure")
+# Three equal-length float64 columns: temperatures, humidities, pressures
+Batch = Tuple[array, array, array]
 
 # Observer interface
 class Observer(ABC):
@@ -7,8 +23,295 @@ class Observer(ABC):
     def update(self, temperature: float, humidity: float, pressure: float) -> None:
         pass
 
+class BatchObserver(Observer):
+    """
+    Observer that can take a whole batch of readings in one call. Columns are
+    float64 sequences: arrays, or memoryviews over stored readings that are
+    only valid for the duration of the call. Observers must not modify them.
+    """
+    @abstractmethod
+    def update_batch(self, temperatures: array, humidities: array, pressures: array) -> None:
+        pass
+
+def as_column(values: Any) -> array:
+    """
+    Convert a NumPy array, buffer or sequence of numbers to a float64 array.
+    Contiguous float64 buffers are copied in one step rather than element by
+    element; a float64 array is returned as it is, without a copy.
+    """
+    if isinstance(values, array) and values.typecode == "d":
+        return values
+    try:
+        view = memoryview(values)
+    except TypeError:
+        return array("d", values)
+    if view.format == "d" and view.c_contiguous:
+        column = array("d")
+        column.frombytes(view.cast("B"))
+        return column
+    return array("d", view.tolist() if view.ndim else values)
+
+def report_error(observer: Observer, error: BaseException) -> None:
+    print(f"Observer {type(observer).__name__} failed: {error!r}")
+
+# Dispatcher interface - decides how notify() reaches the observers
+class Dispatcher(ABC):
+    def __init__(self, on_error: Callable[[Observer, BaseException], None] = report_error):
+        self._on_error = on_error
+    
+    @abstractmethod
+    def dispatch(self, observers: Iterable[Observer], measurements: Measurements) -> None:
+        pass
+    
+    def remove(self, observer: Observer) -> None:
+        """Release anything held for an observer that was detached"""
+        pass
+    
+    def close(self) -> None:
+        pass
+    
+    def dispatch_batch(self, observers: Iterable[Observer], batch: Batch) -> None:
+        """
+        Deliver a batch as one unit per observer. Batch-aware observers get it
+        in a single update_batch() call; everyone else gets the readings one
+        at a time. This default runs on the producer's thread; dispatchers
+        that move work elsewhere override it to move batches the same way.
+        """
+        for observer in observers:
+            self._deliver(observer, batch, True)
+    
+    @staticmethod
+    def _apply(observer: Observer, payload: Any, batch: bool) -> None:
+        if not batch:
+            observer.update(*payload)
+        elif isinstance(observer, BatchObserver):
+            observer.update_batch(*payload)
+        else:
+            for measurements in zip(*payload):
+                observer.update(*measurements)
+    
+    @staticmethod
+    def _copy(batch: Batch) -> Batch:
+        """
+        A private copy of a batch, for dispatchers that deliver it after
+        set_measurements_batch() returns, when the producer may already be
+        refilling the arrays it passed in
+        """
+        return tuple(array("d", column) for column in batch)
+    
+    def _deliver(self, observer: Observer, payload: Any, batch: bool = False) -> None:
+        """Deliver one reading, or a whole batch, reporting rather than raising errors"""
+        try:
+            self._apply(observer, payload, batch)
+        except Exception as error:
+            self._on_error(observer, error)
+
+# Concrete Dispatchers
+class SerialDispatcher(Dispatcher):
+    """Calls each observer in turn on the producer's thread"""
+    def dispatch(self, observers: Iterable[Observer], measurements: Measurements) -> None:
+        for observer in observers:
+            self._deliver(observer, measurements)
+
+class ThreadPoolDispatcher(Dispatcher):
+    """
+    Runs updates on a thread pool without waiting for them. An observer with
+    an update still in flight skips new readings, so a stuck observer holds
+    at most one worker; it is reported once it has run longer than timeout.
+    """
+    def __init__(self, max_workers: int = 4, timeout: float = 1.0,
+                 on_error: Callable[[Observer, BaseException], None] = report_error):
+        super().__init__(on_error)
+        self._pool = ThreadPoolExecutor(max_workers=max_workers)
+        self._timeout = timeout
+        self._in_flight: Dict[Observer, Tuple[Future, float]] = {}
+        self._reported: set = set()
+        self.skipped = 0
+    
+    def dispatch(self, observers: Iterable[Observer], measurements: Measurements) -> None:
+        self._submit(observers, measurements, False)
+    
+    def dispatch_batch(self, observers: Iterable[Observer], batch: Batch) -> None:
+        self._submit(observers, self._copy(batch), True)
+    
+    def _submit(self, observers: Iterable[Observer], payload: Any, batch: bool) -> None:
+        now = time.monotonic()
+        for observer in observers:
+            running = self._in_flight.get(observer)
+            if running is not None and not running[0].done():
+                self.skipped += 1
+                if now - running[1] > self._timeout and observer not in self._reported:
+                    self._reported.add(observer)
+                    self._on_error(observer, TimeoutError(f"update running for over {self._timeout}s"))
+                continue
+            self._reported.discard(observer)
+            future = self._pool.submit(self._deliver, observer, payload, batch)
+            self._in_flight[observer] = (future, now)
+    
+    def remove(self, observer: Observer) -> None:
+        self._in_flight.pop(observer, None)
+        self._reported.discard(observer)
+    
+    def close(self) -> None:
+        self._pool.shutdown(wait=True)
+
+class AsyncioDispatcher(Dispatcher):
+    """
+    Schedules updates on an asyncio event loop, which may be running in
+    another thread. Observers may define update as async def; each call is
+    wrapped in a timeout. Plain updates run in the loop's default executor
+    so they cannot stall the loop. A thread cannot be cancelled, so, as with
+    ThreadPoolDispatcher, an observer whose plain update is still running
+    skips new readings and a stuck observer holds at most one worker.
+    """
+    def __init__(self, loop: asyncio.AbstractEventLoop, timeout: float = 1.0,
+                 on_error: Callable[[Observer, BaseException], None] = report_error):
+        super().__init__(on_error)
+        self._loop = loop
+        self._timeout = timeout
+        # Only touched on the loop's thread
+        self._in_flight: Dict[Observer, asyncio.Future] = {}
+        self.skipped = 0
+    
+    def dispatch(self, observers: Iterable[Observer], measurements: Measurements) -> None:
+        for observer in observers:
+            asyncio.run_coroutine_threadsafe(self._run(observer, measurements, False), self._loop)
+    
+    def dispatch_batch(self, observers: Iterable[Observer], batch: Batch) -> None:
+        batch = self._copy(batch)
+        for observer in observers:
+            asyncio.run_coroutine_threadsafe(self._run(observer, batch, True), self._loop)
+    
+    def remove(self, observer: Observer) -> None:
+        self._loop.call_soon_threadsafe(self._in_flight.pop, observer, None)
+    
+    @staticmethod
+    async def _apply_async(observer: Observer, payload: Any, batch: bool) -> None:
+        if not batch:
+            await observer.update(*payload)
+        elif isinstance(observer, BatchObserver):
+            await observer.update_batch(*payload)
+        else:
+            for measurements in zip(*payload):
+                await observer.update(*measurements)
+    
+    async def _run(self, observer: Observer, payload: Any, batch: bool) -> None:
+        try:
+            method = observer.update_batch if batch and isinstance(observer, BatchObserver) else observer.update
+            if inspect.iscoroutinefunction(method):
+                await asyncio.wait_for(self._apply_async(observer, payload, batch), self._timeout)
+                return
+            running = self._in_flight.get(observer)
+            if running is not None and not running.done():
+                self.skipped += 1
+                return
+            # _deliver reports its own errors, so the future never fails
+            running = self._loop.run_in_executor(None, self._deliver, observer, payload, batch)
+            self._in_flight[observer] = running
+            # Shielded, so a timeout leaves the future pending until the thread really finishes
+            await asyncio.wait_for(asyncio.shield(running), self._timeout)
+        except asyncio.TimeoutError:
+            self._on_error(observer, TimeoutError(f"update took longer than {self._timeout}s"))
+        except Exception as error:
+            self._on_error(observer, error)
+
+class _Mailbox:
+    """Bounded per-observer queue of readings and batches, drained by its own worker thread"""
+    def __init__(self, dispatcher: "QueuedDispatcher", observer: Observer, maxsize: int, policy: str):
+        self._dispatcher = dispatcher
+        self._observer = observer
+        self._queue: Deque[Tuple[Any, bool]] = deque()
+        self._maxsize = maxsize
+        self._policy = policy
+        self._ready = threading.Condition()
+        self._closed = False
+        self.dropped = 0
+        self._thread = threading.Thread(target=self._drain, daemon=True)
+        self._thread.start()
+    
+    def put(self, payload: Any, batch: bool = False) -> None:
+        with self._ready:
+            if len(self._queue) >= self._maxsize:
+                self.dropped += 1
+                if self._policy == "drop":
+                    return
+                # Coalesce: the new item supersedes the newest queued one
+                self._queue.pop()
+            self._queue.append((payload, batch))
+            self._ready.notify()
+    
+    def close(self) -> None:
+        with self._ready:
+            self._closed = True
+            self._ready.notify()
+        self._thread.join()
+    
+    def _drain(self) -> None:
+        while True:
+            with self._ready:
+                while not self._queue and not self._closed:
+                    self._ready.wait()
+                if not self._queue:
+                    return
+                payload, batch = self._queue.popleft()
+            self._dispatcher._deliver(self._observer, payload, batch)
+
+class QueuedDispatcher(Dispatcher):
+    """
+    Gives every observer its own bounded queue and worker thread. When a slow
+    observer's queue is full, new readings are dropped ("drop") or replace
+    the newest queued reading ("coalesce"); other observers are unaffected.
+    """
+    def __init__(self, maxsize: int = 16, policy: str = "coalesce",
+                 on_error: Callable[[Observer, BaseException], None] = report_error):
+        super().__init__(on_error)
+        if policy not in ("drop", "coalesce"):
+            raise ValueError(f"Unknown queue policy: {policy}")
+        self._maxsize = maxsize
+        self._policy = policy
+        self._mailboxes: Dict[Observer, _Mailbox] = {}
+    
+    def dispatch(self, observers: Iterable[Observer], measurements: Measurements) -> None:
+        for observer in observers:
+            self._mailbox(observer).put(measurements)
+    
+    def dispatch_batch(self, observers: Iterable[Observer], batch: Batch) -> None:
+        batch = self._copy(batch)
+        for observer in observers:
+            self._mailbox(observer).put(batch, True)
+    
+    def _mailbox(self, observer: Observer) -> _Mailbox:
+        mailbox = self._mailboxes.get(observer)
+        if mailbox is None:
+            mailbox = self._mailboxes[observer] = _Mailbox(self, observer, self._maxsize, self._policy)
+        return mailbox
+    
+    def dropped(self, observer: Observer) -> int:
+        mailbox = self._mailboxes.get(observer)
+        return mailbox.dropped if mailbox else 0
+    
+    def remove(self, observer: Observer) -> None:
+        mailbox = self._mailboxes.pop(observer, None)
+        if mailbox is not None:
+            mailbox.close()
+    
+    def close(self) -> None:
+        """Deliver everything still queued, then stop the workers"""
+        for mailbox in self._mailboxes.values():
+            mailbox.close()
+        self._mailboxes.clear()
+
 # Subject interface
 class Subject(ABC):
+    def __init__(self):
+        self._dispatcher: Dispatcher = SerialDispatcher()
+    
+    def set_dispatcher(self, dispatcher: Dispatcher) -> None:
+        """Switch dispatchers; the one being replaced is closed"""
+        previous, self._dispatcher = self._dispatcher, dispatcher
+        if previous is not dispatcher:
+            previous.close()
+    
     @abstractmethod
     def attach(self, observer: Observer) -> None:
         pass
@@ -21,30 +324,143 @@ class Subject(ABC):
     def notify(self) -> None:
         pass
 
+# Subscription to a single measurement field
+class Subscription:
+    def __init__(self, observer: Observer, field: str, threshold: float):
+        self.observer = observer
+        self.field = field
+        self.threshold = threshold
+        # Value this observer was last woken for; None until the first reading
+        self.last_value: Optional[float] = None
+    
+    def triggered_by(self, value: float) -> bool:
+        if self.last_value is None or abs(value - self.last_value) > self.threshold:
+            self.last_value = value
+            return True
+        return False
+
 # Concrete Subject
 class WeatherStation(Subject):
     def __init__(self):
-        self._observers: List[Observer] = []
+        super().__init__()
+        # Observers of every reading; a dict keeps attach order with O(1) attach/detach
+        self._observers: Dict[Observer, None] = {}
+        # Field -> observers only woken when that field changes enough
+        self._subscriptions: Dict[str, Dict[Observer, Subscription]] = {field: {} for field in FIELDS}
+        self._last_checked: Optional[Measurements] = None
         self._temperature = 0.0
         self._humidity = 0.0
         self._pressure = 0.0
+        # Optional rate limit; readings arriving too soon are coalesced
+        self._min_interval = 0.0
+        self._last_notify = -math.inf
+        self._pending: Optional[threading.Timer] = None
+        self._lock = threading.Lock()
+        # Held while a rate-limited notification is decided and sent, by the producer or the timer
+        self._notifying = threading.RLock()
     
     def attach(self, observer: Observer) -> None:
-        if observer not in self._observers:
-            self._observers.append(observer)
+        self._observers[observer] = None
     
     def detach(self, observer: Observer) -> None:
-        self._observers.remove(observer)
+        """Remove the observer and all of its field subscriptions"""
+        attached = self._observers.pop(observer, False) is None
+        subscribed = False
+        for subscribers in self._subscriptions.values():
+            subscribed = subscribers.pop(observer, None) is not None or subscribed
+        if not (attached or subscribed):
+            raise ValueError("Observer is not attached")
+        self._dispatcher.remove(observer)
+    
+    def subscribe(self, observer: Observer, field: str, threshold: float = 0.0) -> None:
+        """Wake observer only when field moves more than threshold from the value it last saw"""
+        if field not in self._subscriptions:
+            raise ValueError(f"Unknown field: {field}")
+        self._subscriptions[field][observer] = Subscription(observer, field, threshold)
+        # The new subscriber has seen nothing yet, so the next reading must be checked in full
+        self._last_checked = None
+    
+    def unsubscribe(self, observer: Observer, field: str) -> None:
+        del self._subscriptions[field][observer]
     
     def notify(self) -> None:
-        for observer in self._observers:
-            observer.update(self._temperature, self._humidity, self._pressure)
+        measurements = (self._temperature, self._humidity, self._pressure)
+        self._dispatcher.dispatch(self._interested(measurements), measurements)
+    
+    def _interested(self, measurements: Measurements) -> List[Observer]:
+        """
+        Attached observers plus subscribers whose field changed past their
+        threshold. Unchanged fields are skipped outright, but every subscriber
+        of a changed field is checked, so the cost grows with how many watch
+        that field, not with how many of them are woken.
+        """
+        interested = list(self._observers)
+        woken = set()
+        previous = self._last_checked or (None, None, None)
+        self._last_checked = measurements
+        for field, value, last in zip(FIELDS, measurements, previous):
+            # A field that has not moved cannot push any subscriber past its threshold
+            if value == last:
+                continue
+            for observer, subscription in self._subscriptions[field].items():
+                if subscription.triggered_by(value) and observer not in woken and observer not in self._observers:
+                    woken.add(observer)
+                    interested.append(observer)
+        return interested
     
     def set_measurements(self, temperature: float, humidity: float, pressure: float) -> None:
         self._temperature = temperature
         self._humidity = humidity
         self._pressure = pressure
-        self.notify()
+        if self._min_interval:
+            self._notify_limited()
+        else:
+            self.notify()
+    
+    def set_measurements_batch(self, temperatures: Any, humidities: Any, pressures: Any) -> None:
+        """Ingest many readings at once; observers get one fan-out for the whole batch"""
+        batch = (as_column(temperatures), as_column(humidities), as_column(pressures))
+        if not len(batch[0]) == len(batch[1]) == len(batch[2]):
+            raise ValueError("Measurement columns must have the same length")
+        if not batch[0]:
+            return
+        self._temperature, self._humidity, self._pressure = batch[0][-1], batch[1][-1], batch[2][-1]
+        # Field subscriptions are judged on the batch's final reading
+        self._dispatcher.dispatch_batch(self._interested((self._temperature, self._humidity, self._pressure)), batch)
+    
+    def set_rate_limit(self, max_per_second: Optional[float]) -> None:
+        """Coalesce set_measurements() so observers are notified at most max_per_second times"""
+        self._min_interval = 1.0 / max_per_second if max_per_second else 0.0
+    
+    def _notify_limited(self) -> None:
+        # Deciding and notifying happen under one lock, so notifications start at least an interval apart
+        with self._notifying:
+            with self._lock:
+                now = time.monotonic()
+                wait = self._last_notify + self._min_interval - now
+                if wait > 0:
+                    # Too soon: make sure the latest reading goes out once the interval is up
+                    if self._pending is None:
+                        self._pending = threading.Timer(wait, self._notify_pending)
+                        self._pending.daemon = True
+                        self._pending.start()
+                    return
+                self._last_notify = now
+                # This notification carries the latest reading, so a pending timer has nothing left to send
+                if self._pending is not None:
+                    self._pending.cancel()
+                    self._pending = None
+            self.notify()
+    
+    def _notify_pending(self) -> None:
+        with self._notifying:
+            with self._lock:
+                # A timer that fired just as set_measurements() notified has been superseded
+                if self._pending is not threading.current_thread():
+                    return
+                self._pending = None
+                self._last_notify = time.monotonic()
+            self.notify()
 
 # Concrete Observers
 class CurrentConditionsDisplay(Observer):
@@ -54,22 +470,183 @@ class CurrentConditionsDisplay(Observer):
         print(f"Humidity: {humidity}%")
         print(f"Pressure: {pressure} hPa")
 
-class StatisticsDisplay(Observer):
+# Running statistics helpers
+class RunningStats:
+    """All-time count, mean, variance (Welford), minimum and maximum in O(1) per value"""
     def __init__(self):
-        self._temperatures: List[float] = []
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+    
+    def add(self, value: float) -> None:
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        if value < self.minimum:
+            self.minimum = value
+        if value > self.maximum:
+            self.maximum = value
+    
+    def add_batch(self, values: array) -> None:
+        """Merge a whole batch using the pairwise (Chan et al.) update"""
+        n = len(values)
+        if not n:
+            return
+        # Shift by the first value so the sum of squares does not cancel badly
+        shift = values[0]
+        shifted = array("d", map(sub, values, repeat(shift)))
+        total = math.fsum(shifted)
+        batch_mean = shift + total / n
+        batch_m2 = math.fsum(map(mul, shifted, shifted)) - total * total / n
+        
+        count = self.count + n
+        delta = batch_mean - self.mean
+        self.mean += delta * n / count
+        self._m2 += batch_m2 + delta * delta * self.count * n / count
+        self.count = count
+        self.minimum = min(self.minimum, min(values))
+        self.maximum = max(self.maximum, max(values))
+    
+    @property
+    def variance(self) -> float:
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+    
+    @property
+    def stddev(self) -> float:
+        return math.sqrt(self.variance)
+
+class SlidingWindow:
+    """
+    Mean, minimum and maximum over the last size values or the last duration
+    seconds. Minimum and maximum come from monotonic deques, so each value is
+    pushed and popped at most once and every operation is amortised O(1).
+    Time-based windows also drop expired values when they are read, so a
+    window with no new readings empties as time passes.
+    """
+    def __init__(self, size: Optional[int] = None, duration: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        if (size is None) == (duration is None):
+            raise ValueError("Give exactly one of size or duration")
+        self._size = size
+        self._duration = duration
+        self._clock = clock
+        self._values: Deque[Tuple[int, float, float]] = deque()  # (sequence, timestamp, value)
+        self._max: Deque[Tuple[int, float]] = deque()  # decreasing values
+        self._min: Deque[Tuple[int, float]] = deque()  # increasing values
+        self._sum = 0.0
+        self._sequence = 0
+    
+    def __len__(self) -> int:
+        self._expire()
+        return len(self._values)
+    
+    def _expire(self) -> None:
+        if self._duration is not None:
+            self._evict(self._clock())
+    
+    def add(self, value: float, timestamp: Optional[float] = None) -> None:
+        if timestamp is None:
+            timestamp = self._clock() if self._duration is not None else 0.0
+        sequence = self._sequence
+        self._sequence += 1
+        self._values.append((sequence, timestamp, value))
+        self._sum += value
+        while self._max and self._max[-1][1] <= value:
+            self._max.pop()
+        self._max.append((sequence, value))
+        while self._min and self._min[-1][1] >= value:
+            self._min.pop()
+        self._min.append((sequence, value))
+        self._evict(timestamp)
+    
+    def add_batch(self, values: array, timestamp: Optional[float] = None) -> None:
+        if timestamp is None:
+            timestamp = self._clock() if self._duration is not None else 0.0
+        if self._size is not None:
+            # Anything before the last size values would be evicted straight away
+            values = values[-self._size:]
+        for value in values:
+            self.add(value, timestamp)
+    
+    def _evict(self, now: float) -> None:
+        values = self._values
+        while values and ((self._size is not None and len(values) > self._size) or
+                          (self._duration is not None and now - values[0][1] > self._duration)):
+            sequence, _, value = values.popleft()
+            self._sum -= value
+            if self._max[0][0] == sequence:
+                self._max.popleft()
+            if self._min[0][0] == sequence:
+                self._min.popleft()
+    
+    @property
+    def mean(self) -> float:
+        self._expire()
+        return self._sum / len(self._values) if self._values else 0.0
+    
+    @property
+    def minimum(self) -> float:
+        self._expire()
+        return self._min[0][1] if self._min else math.nan
+    
+    @property
+    def maximum(self) -> float:
+        self._expire()
+        return self._max[0][1] if self._max else math.nan
+
+class StatisticsDisplay(BatchObserver):
+    FIELDS = FIELDS
+    
+    def __init__(self, window_size: Optional[int] = None, window_seconds: Optional[float] = None):
+        self._stats = {field: RunningStats() for field in self.FIELDS}
+        self._windows: Dict[str, SlidingWindow] = {}
+        if window_size is not None or window_seconds is not None:
+            self._windows = {field: SlidingWindow(window_size, window_seconds) for field in self.FIELDS}
+    
+    def record(self, temperature: float, humidity: float, pressure: float) -> None:
+        """Fold one reading into the statistics without printing"""
+        for field, value in zip(self.FIELDS, (temperature, humidity, pressure)):
+            self._stats[field].add(value)
+            if self._windows:
+                self._windows[field].add(value)
+    
+    def record_batch(self, temperatures: array, humidities: array, pressures: array) -> None:
+        for field, values in zip(self.FIELDS, (temperatures, humidities, pressures)):
+            self._stats[field].add_batch(values)
+            if self._windows:
+                self._windows[field].add_batch(values)
+    
+    def stats(self, field: str) -> RunningStats:
+        return self._stats[field]
+    
+    def window(self, field: str) -> Optional[SlidingWindow]:
+        return self._windows.get(field)
     
     def update(self, temperature: float, humidity: float, pressure: float) -> None:
-        self._temperatures.append(temperature)
-        avg_temp = sum(self._temperatures) / len(self._temperatures)
-        max_temp = max(self._temperatures)
-        min_temp = min(self._temperatures)
+        self.record(temperature, humidity, pressure)
+        self._print_statistics()
+    
+    def update_batch(self, temperatures: array, humidities: array, pressures: array) -> None:
+        self.record_batch(temperatures, humidities, pressures)
+        self._print_statistics()
+    
+    def _print_statistics(self) -> None:
+        temps = self._stats["temperature"]
         
         print(f"\nTemperature Statistics:")
-        print(f"Average: {avg_temp:.1f}°C")
-        print(f"Maximum: {max_temp}°C")
-        print(f"Minimum: {min_temp}°C")
+        print(f"Average: {temps.mean:.1f}°C")
+        print(f"Maximum: {temps.maximum}°C")
+        print(f"Minimum: {temps.minimum}°C")
+        print(f"Std dev: {temps.stddev:.2f}°C")
+        if self._windows:
+            window = self._windows["temperature"]
+            print(f"Recent ({len(window)} readings): avg {window.mean:.1f}°C, "
+                  f"max {window.maximum}°C, min {window.minimum}°C")
 
-class ForecastDisplay(Observer):
+class ForecastDisplay(BatchObserver):
     def __init__(self):
         self._last_pressure = 0.0
         self._current_pressure = 0.0
@@ -77,7 +654,15 @@ class ForecastDisplay(Observer):
     def update(self, temperature: float, humidity: float, pressure: float) -> None:
         self._last_pressure = self._current_pressure
         self._current_pressure = pressure
-        
+        self._print_forecast()
+    
+    def update_batch(self, temperatures: array, humidities: array, pressures: array) -> None:
+        # Only the last two pressures decide the forecast
+        self._last_pressure = pressures[-2] if len(pressures) > 1 else self._current_pressure
+        self._current_pressure = pressures[-1]
+        self._print_forecast()
+    
+    def _print_forecast(self) -> None:
         print("\nForecast:")
         if self._current_pressure > self._last_pressure:
             print("Improving weather on the way!")
@@ -86,20 +671,79 @@ class ForecastDisplay(Observer):
         else:
             print("Watch out for cooler, rainy weather")
 
+# Benchmarks
+def benchmark_statistics(updates: int = 10_000_000, report_every: int = 1_000_000) -> None:
+    display = StatisticsDisplay(window_size=1000)
+    start = time.perf_counter()
+    for i in range(updates):
+        display.record(20.0 + (i * 7919 % 1000) / 100, 50.0 + i % 40, 1000.0 + i % 30)
+        if (i + 1) % report_every == 0:
+            now = time.perf_counter()
+            # Everything the display retains lives in its windows' deques
+            retained = sum(sys.getsizeof(window._values) + sys.getsizeof(window._min) + sys.getsizeof(window._max)
+                           for window in display._windows.values())
+            print(f"{i + 1:>11,} updates: {(now - start) / report_every * 1e9:6.0f}ns/update, "
+                  f"{retained / 1024:.0f}KB retained")
+            start = time.perf_counter()
+
+def benchmark_subscriptions(observer_count: int = 10_000, rounds: int = 200) -> None:
+    """Notify cost as the share of observers interested in the changing field grows, and with thresholds alone"""
+    class CountingObserver(Observer):
+        calls = 0
+        
+        def update(self, temperature: float, humidity: float, pressure: float) -> None:
+            CountingObserver.calls += 1
+    
+    for interested in (10, 100, 1000, observer_count):
+        station = WeatherStation()
+        for i in range(observer_count):
+            # Only the interested observers watch pressure, which is the field that changes
+            station.subscribe(CountingObserver(), "pressure" if i < interested else "humidity", 0.5)
+        station.set_measurements(20.0, 50.0, 1000.0)
+        CountingObserver.calls = 0
+        start = time.perf_counter()
+        for i in range(rounds):
+            station.set_measurements(20.0, 50.0, 1000.0 + i)
+        elapsed = time.perf_counter() - start
+        print(f"{interested:>6} of {observer_count} interested: "
+              f"{elapsed / rounds * 1e6:8.1f}us per notify ({CountingObserver.calls // rounds} woken)")
+    
+    # Thresholds do not narrow the scan: every subscriber of the changing field is checked
+    for woken in (10, 100, 1000, observer_count):
+        station = WeatherStation()
+        for i in range(observer_count):
+            station.subscribe(CountingObserver(), "pressure", 0.5 if i < woken else math.inf)
+        station.set_measurements(20.0, 50.0, 1000.0)
+        CountingObserver.calls = 0
+        start = time.perf_counter()
+        for i in range(rounds):
+            station.set_measurements(20.0, 50.0, 1000.0 + i)
+        elapsed = time.perf_counter() - start
+        print(f"all {observer_count} on pressure, {woken:>6} past threshold: "
+              f"{elapsed / rounds * 1e6:8.1f}us per notify ({CountingObserver.calls // rounds} woken)")
+
 # Client code
 def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "--benchmark":
+        if len(sys.argv) > 2 and sys.argv[2] == "subscriptions":
+            benchmark_subscriptions()
+        else:
+            benchmark_statistics()
+        return
+    
     # Create the WeatherStation
     weather_station = WeatherStation()
     
     # Create displays
     current_display = CurrentConditionsDisplay()
-    statistics_display = StatisticsDisplay()
+    statistics_display = StatisticsDisplay(window_size=2)
     forecast_display = ForecastDisplay()
     
     # Register displays with WeatherStation
     weather_station.attach(current_display)
     weather_station.attach(statistics_display)
-    weather_station.attach(forecast_display)
+    # The forecast only depends on pressure, so only wake it for real pressure changes
+    weather_station.subscribe(forecast_display, "pressure", threshold=0.5)
     
     # Simulate weather changes
     print("First weather update:")
@@ -117,6 +761,23 @@ def main():
     
     print("\nFourth weather update:")
     weather_station.set_measurements(24.5, 80.0, 1011.2)
+    
+    # Queue updates per observer so a slow display cannot hold up the station
+    print("\nSwitching to queued dispatch...")
+    dispatcher = QueuedDispatcher(maxsize=1, policy="coalesce")
+    weather_station.set_dispatcher(dispatcher)
+    weather_station.detach(statistics_display)
+    weather_station.set_measurements(22.0, 75.0, 1012.0)
+    
+    # Switching back closes the queued dispatcher, which delivers what is still queued
+    weather_station.set_dispatcher(SerialDispatcher())
+    
+    # A whole batch of readings reaches batch-aware observers in one call
+    print("\nBatch update of three readings...")
+    weather_station.detach(current_display)
+    weather_station.attach(statistics_display)
+    weather_station.subscribe(forecast_display, "pressure", threshold=0.5)
+    weather_station.set_measurements_batch([21.0, 22.5, 24.0], [70.0, 72.0, 68.0], [1012.0, 1013.5, 1015.0])
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -0,0 +1,250 @@
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Any, Optional
+
+from observer import (BatchObserver, CurrentConditionsDisplay, Observer,
+                      StatisticsDisplay, WeatherStation, as_column)
+
+# Log layout:
+#   header   magic, record count (padded to 64 bytes so records stay aligned)
+#   records  (timestamp, temperature, humidity, pressure) as packed float64
+# Records are appended in timestamp order, so the timestamp column itself is
+# the index: a range query is two binary searches over the mapped file.
+MAGIC = b"WXLOG001"
+HEADER = struct.Struct("<8sQ")
+HEADER_SIZE = 64
+RECORD = struct.Struct("<dddd")
+FIELDS_PER_RECORD = 4
+
+class _TimestampColumn:
+    """Sequence view of the timestamps so bisect can search the file directly"""
+    def __init__(self, log: "MeasurementLog"):
+        self._log = log
+
+    def __len__(self) -> int:
+        return self._log._count
+
+    def __getitem__(self, index: int) -> float:
+        return struct.unpack_from("<d", self._log._map, HEADER_SIZE + index * RECORD.size)[0]
+
+# Append-only, memory-mapped measurement log
+class MeasurementLog:
+    def __init__(self, path: str, initial_capacity: int = 1024):
+        """Open the log at path, creating it only if nothing exists there yet"""
+        try:
+            self._file = open(path, "r+b")
+            exists = True
+        except FileNotFoundError:
+            # Exclusive creation, so an existing file is never truncated
+            self._file = open(path, "x+b")
+            exists = False
+        size = os.fstat(self._file.fileno()).st_size
+        if exists and size < HEADER_SIZE:
+            self._file.close()
+            raise ValueError(f"{path} is not a measurement log")
+        if not exists:
+            self._file.truncate(HEADER_SIZE + initial_capacity * RECORD.size)
+        self._map = mmap.mmap(self._file.fileno(), 0)
+        if exists:
+            magic, self._count = HEADER.unpack_from(self._map, 0)
+            if magic != MAGIC or HEADER_SIZE + self._count * RECORD.size > size:
+                self.close()
+                raise ValueError(f"{path} is not a measurement log")
+        else:
+            self._count = 0
+            HEADER.pack_into(self._map, 0, MAGIC, 0)
+        self._timestamps = _TimestampColumn(self)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __enter__(self) -> "MeasurementLog":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._map is not None:
+            self._map.flush()
+            self._map.close()
+            self._map = None
+            self._file.close()
+
+    def append(self, timestamp: float, temperature: float, humidity: float, pressure: float) -> None:
+        if self._count and timestamp < self._timestamps[self._count - 1]:
+            raise ValueError("Timestamps must not go backwards")
+        self._reserve(1)
+        RECORD.pack_into(self._map, HEADER_SIZE + self._count * RECORD.size,
+                         timestamp, temperature, humidity, pressure)
+        self._commit(self._count + 1)
+
+    def append_batch(self, timestamps: Any, temperatures: Any, humidities: Any, pressures: Any) -> None:
+        columns = [as_column(values) for values in (timestamps, temperatures, humidities, pressures)]
+        n = len(columns[0])
+        if any(len(column) != n for column in columns):
+            raise ValueError("Measurement columns must have the same length")
+        if not n:
+            return
+        stamps = columns[0]
+        last = self._timestamps[self._count - 1] if self._count else stamps[0]
+        if stamps[0] < last or any(b < a for a, b in zip(stamps, stamps[1:])):
+            raise ValueError("Timestamps must not go backwards")
+        # Interleave the columns into records and copy them in one go
+        rows = array("d", bytes(n * RECORD.size))
+        for i, column in enumerate(columns):
+            rows[i::FIELDS_PER_RECORD] = column
+        self._reserve(n)
+        start = HEADER_SIZE + self._count * RECORD.size
+        self._map[start:start + n * RECORD.size] = rows.tobytes()
+        self._commit(self._count + n)
+
+    def _reserve(self, records: int) -> None:
+        needed = HEADER_SIZE + (self._count + records) * RECORD.size
+        if needed > len(self._map):
+            self._map.resize(max(needed, 2 * len(self._map)))
+
+    def _commit(self, count: int) -> None:
+        # The count is written after the records, so a crash never exposes half a record
+        self._count = count
+        struct.pack_into("<Q", self._map, 8, count)
+
+    def find_range(self, start: Optional[float] = None, end: Optional[float] = None) -> range:
+        """Indices of the records with start <= timestamp <= end"""
+        first = 0 if start is None else bisect_left(self._timestamps, start)
+        last = self._count if end is None else bisect_right(self._timestamps, end)
+        return range(first, max(first, last))
+
+    def view(self, start: Optional[float] = None, end: Optional[float] = None) -> memoryview:
+        """
+        Zero-copy view of the records in a time range, shaped (records, 4) as
+        (timestamp, temperature, humidity, pressure). numpy.asarray() on it
+        wraps the mapped memory without copying. The view must be released
+        before the log is closed or grown.
+        """
+        indices = self.find_range(start, end)
+        first = HEADER_SIZE + indices.start * RECORD.size
+        raw = memoryview(self._map)[first:first + len(indices) * RECORD.size]
+        return raw.cast("d", (len(indices), FIELDS_PER_RECORD))
+
+    def replay(self, observer: Observer, start: Optional[float] = None, end: Optional[float] = None) -> int:
+        """
+        Feed a time range to an observer without copying it. Batch observers
+        get three strided memoryviews over the mapped temperature, humidity
+        and pressure columns in one call. The views are released when the
+        call returns, so an observer must copy anything it wants to keep.
+        """
+        indices = self.find_range(start, end)
+        if not indices:
+            return 0
+        first = HEADER_SIZE + indices.start * RECORD.size
+        with memoryview(self._map)[first:first + len(indices) * RECORD.size] as raw:
+            if isinstance(observer, BatchObserver):
+                with raw.cast("d") as flat:
+                    columns = [flat[field::FIELDS_PER_RECORD] for field in range(1, FIELDS_PER_RECORD)]
+                    try:
+                        observer.update_batch(*columns)
+                    finally:
+                        for column in columns:
+                            column.release()
+            else:
+                for _, temperature, humidity, pressure in RECORD.iter_unpack(raw):
+                    observer.update(temperature, humidity, pressure)
+        return len(indices)
+
+# Station that records every reading it publishes
+class RecordingWeatherStation(WeatherStation):
+    def __init__(self, log: MeasurementLog, clock=time.time):
+        super().__init__()
+        self._log = log
+        self._clock = clock
+
+    @property
+    def history(self) -> MeasurementLog:
+        return self._log
+
+    def set_measurements(self, temperature: float, humidity: float, pressure: float) -> None:
+        self._log.append(self._clock(), temperature, humidity, pressure)
+        super().set_measurements(temperature, humidity, pressure)
+
+    def set_measurements_batch(self, temperatures: Any, humidities: Any, pressures: Any) -> None:
+        temperatures = as_column(temperatures)
+        now = self._clock()
+        self._log.append_batch(array("d", [now]) * len(temperatures), temperatures, humidities, pressures)
+        super().set_measurements_batch(temperatures, humidities, pressures)
+
+    def attach_with_replay(self, observer: Observer, since: Optional[float] = None) -> None:
+        """Catch a new or recovering observer up from the log, then attach it"""
+        self._log.replay(observer, since)
+        self.attach(observer)
+
+# Benchmark
+def benchmark(records: int = 10_000_000) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        with MeasurementLog(os.path.join(tmp, "history.log")) as log:
+            chunk = 1_000_000
+            start = time.perf_counter()
+            for offset in range(0, records, chunk):
+                n = min(chunk, records - offset)
+                log.append_batch(array("d", range(offset, offset + n)), array("d", [20.0]) * n,
+                                 array("d", [50.0]) * n, array("d", [1000.0]) * n)
+            print(f"Appended {records:,} records in {time.perf_counter() - start:.2f}s")
+
+            start = time.perf_counter()
+            with log.view(records * 0.25, records * 0.75) as view:
+                found = time.perf_counter() - start
+                start = time.perf_counter()
+                total = view.nbytes
+                copied = bytes(view)
+                elapsed = time.perf_counter() - start
+            del copied
+            print(f"Range lookup: {found * 1e6:.1f}us; scanning {total / 2**20:.0f}MB view: "
+                  f"{total / 2**30 / elapsed:.2f}GB/s")
+
+            # Replay hands out views, so its cost does not depend on the range length
+            observer = _ColumnSum()
+            start = time.perf_counter()
+            replayed = log.replay(observer, records * 0.25, records * 0.75)
+            elapsed = time.perf_counter() - start
+            print(f"Replay of {replayed:,} records to a batch observer: {(elapsed - observer.elapsed) * 1e3:.2f}ms "
+                  f"hand-off, {observer.elapsed * 1e3:.2f}ms for the observer to sum the pressure view")
+
+class _ColumnSum(BatchObserver):
+    """Benchmark observer that reads one column straight from the views it is given"""
+    def update(self, temperature: float, humidity: float, pressure: float) -> None:
+        pass
+
+    def update_batch(self, temperatures: Any, humidities: Any, pressures: Any) -> None:
+        start = time.perf_counter()
+        self.total = sum(pressures)
+        self.elapsed = time.perf_counter() - start
+
+# Client code
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "--benchmark":
+        benchmark()
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        with MeasurementLog(os.path.join(tmp, "history.log")) as log:
+            clock = iter(range(100)).__next__
+            station = RecordingWeatherStation(log, clock=clock)
+            station.set_measurements(25.2, 65.0, 1013.1)
+            station.set_measurements(26.8, 70.0, 1014.3)
+            station.set_measurements(23.9, 90.0, 1009.5)
+
+            print("Late observer catching up on readings from t=1 onwards:")
+            station.attach_with_replay(CurrentConditionsDisplay(), since=1)
+
+            print("\nStatistics rebuilt from the full history:")
+            statistics = StatisticsDisplay()
+            log.replay(statistics)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+import multiprocessing
+import struct
+import sys
+import time
+from multiprocessing import shared_memory
+from typing import Any, Callable, List, Optional, Tuple
+
+from observer import (CurrentConditionsDisplay, Measurements, Observer,
+                      StatisticsDisplay, WeatherStation, as_column)
+
+# Ring layout:
+#   header  published reading count, closed flag (padded to a cache line)
+#   slots   capacity x (stamp, temperature, humidity, pressure)
+# A single writer fills slot n % capacity. Its stamp is 2n+1 while the write
+# is in progress and 2n+2 once it is complete, so a reader that sees the same
+# complete stamp before and after copying the values knows they were not torn.
+# Readers never take a lock and never write to the block.
+HEADER = struct.Struct("<QQ")
+HEADER_SIZE = 64
+SLOT = struct.Struct("<Qddd")
+STAMP = struct.Struct("<Q")
+VALUES = struct.Struct("<ddd")
+
+class SharedMeasurementRing:
+    def __init__(self, name: Optional[str] = None, capacity: int = 4096, create: bool = True):
+        if create:
+            self._shm = shared_memory.SharedMemory(name=name, create=True, size=HEADER_SIZE + capacity * SLOT.size)
+            HEADER.pack_into(self._shm.buf, 0, 0, 0)
+        else:
+            self._shm = shared_memory.SharedMemory(name=name)
+        self._buf = self._shm.buf
+        self.capacity = (self._shm.size - HEADER_SIZE) // SLOT.size
+        self._owner = create
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    def published(self) -> Tuple[int, bool]:
+        count, closed = HEADER.unpack_from(self._buf, 0)
+        return count, bool(closed)
+
+    def close(self) -> None:
+        self._buf = None
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+
+# Writer side
+class SharedMemoryPublisher(WeatherStation):
+    """WeatherStation that also publishes every reading into a shared ring"""
+    def __init__(self, capacity: int = 4096):
+        super().__init__()
+        self._ring = SharedMeasurementRing(capacity=capacity)
+        self._count = 0
+
+    @property
+    def ring_name(self) -> str:
+        return self._ring.name
+
+    def notify(self) -> None:
+        self._publish(self._temperature, self._humidity, self._pressure)
+        super().notify()
+
+    def set_measurements_batch(self, temperatures: Any, humidities: Any, pressures: Any) -> None:
+        """Publish every reading of the batch, then notify in-process observers as usual"""
+        batch = (as_column(temperatures), as_column(humidities), as_column(pressures))
+        if not len(batch[0]) == len(batch[1]) == len(batch[2]):
+            raise ValueError("Measurement columns must have the same length")
+        for temperature, humidity, pressure in zip(*batch):
+            self._publish(temperature, humidity, pressure)
+        super().set_measurements_batch(*batch)
+
+    def _publish(self, temperature: float, humidity: float, pressure: float) -> None:
+        buf = self._ring._buf
+        n = self._count
+        offset = HEADER_SIZE + (n % self._ring.capacity) * SLOT.size
+        STAMP.pack_into(buf, offset, 2 * n + 1)
+        VALUES.pack_into(buf, offset + STAMP.size, temperature, humidity, pressure)
+        STAMP.pack_into(buf, offset, 2 * n + 2)
+        self._count = n + 1
+        STAMP.pack_into(buf, 0, self._count)
+
+    def close(self) -> None:
+        """Tell readers no more readings are coming"""
+        STAMP.pack_into(self._ring._buf, STAMP.size, 1)
+
+    def unlink(self) -> None:
+        """Release the shared block once every reader has finished"""
+        self._ring.close()
+
+# Reader side
+class SharedMemoryReader:
+    def __init__(self, ring_name: str):
+        self._ring = SharedMeasurementRing(ring_name, create=False)
+        self._cursor = 0
+        self.lost = 0
+
+    def poll(self) -> List[Measurements]:
+        """Return every reading published since the last poll"""
+        published, _ = self._ring.published()
+        if published - self._cursor > self._ring.capacity:
+            # Fell a whole ring behind; those readings were overwritten
+            self.lost += published - self._ring.capacity - self._cursor
+            self._cursor = published - self._ring.capacity
+        readings = []
+        buf = self._ring._buf
+        while self._cursor < published:
+            n = self._cursor
+            offset = HEADER_SIZE + (n % self._ring.capacity) * SLOT.size
+            before = STAMP.unpack_from(buf, offset)[0]
+            measurements = VALUES.unpack_from(buf, offset + STAMP.size)
+            after = STAMP.unpack_from(buf, offset)[0]
+            if before == after == 2 * n + 2:
+                readings.append(measurements)
+            else:
+                # The writer lapped us while copying this slot
+                self.lost += 1
+            self._cursor += 1
+        return readings
+
+    def run(self, observer: Observer, idle_sleep: float = 0.0005) -> None:
+        """Feed readings to observer until the publisher closes the ring"""
+        while True:
+            _, closed = self._ring.published()
+            readings = self.poll()
+            for measurements in readings:
+                observer.update(*measurements)
+            if closed and not readings:
+                return
+            if not readings:
+                time.sleep(idle_sleep)
+
+    def close(self) -> None:
+        self._ring.close()
+
+def observer_process(ring_name: str, observer_factory: Callable[[], Observer],
+                     results: Optional[multiprocessing.Queue] = None) -> None:
+    """Entry point for a worker process running one observer; reports its lost count to results if given"""
+    reader = SharedMemoryReader(ring_name)
+    try:
+        reader.run(observer_factory())
+        if results is not None:
+            results.put(reader.lost)
+    finally:
+        reader.close()
+
+def start_observer_processes(station: SharedMemoryPublisher, factories: List[Callable[[], Observer]],
+                             results: Optional[multiprocessing.Queue] = None) -> List[multiprocessing.Process]:
+    processes = [multiprocessing.Process(target=observer_process, args=(station.ring_name, factory, results))
+                 for factory in factories]
+    for process in processes:
+        process.start()
+    return processes
+
+# Benchmark
+class SilentStatisticsDisplay(StatisticsDisplay):
+    def update(self, temperature: float, humidity: float, pressure: float) -> None:
+        self.record(temperature, humidity, pressure)
+
+def benchmark(updates: int = 200_000, readers: int = 3) -> None:
+    in_process = WeatherStation()
+    for _ in range(readers):
+        in_process.attach(SilentStatisticsDisplay())
+    start = time.perf_counter()
+    for i in range(updates):
+        in_process.set_measurements(20.0 + i % 10, 50.0, 1000.0 + i % 7)
+    elapsed = time.perf_counter() - start
+    print(f"In-process notify: {updates / elapsed:,.0f} updates/s")
+
+    station = SharedMemoryPublisher(capacity=1 << 16)
+    results = multiprocessing.Queue()
+    processes = start_observer_processes(station, [SilentStatisticsDisplay] * readers, results)
+    start = time.perf_counter()
+    for i in range(updates):
+        station.set_measurements(20.0 + i % 10, 50.0, 1000.0 + i % 7)
+    produced = time.perf_counter() - start
+    station.close()
+    # Readers skip slots the writer overwrote, so only the readings they actually saw count
+    lost = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+    consumed = time.perf_counter() - start
+    station.unlink()
+    print(f"Shared memory: {updates / produced:,.0f} updates/s published, "
+          f"{(updates - max(lost)) / consumed:,.0f} updates/s consumed by the slowest of {readers} processes "
+          f"(lost per reader: {lost})")
+
+# Client code
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "--benchmark":
+        benchmark()
+        return
+
+    station = SharedMemoryPublisher()
+    processes = start_observer_processes(station, [CurrentConditionsDisplay])
+    station.set_measurements(25.2, 65.0, 1013.1)
+    station.set_measurements(26.8, 70.0, 1014.3)
+    station.set_measurements(23.9, 90.0, 1009.5)
+    station.set_measurements_batch([21.0, 22.5], [70.0, 72.0], [1012.0, 1013.5])
+    station.close()
+    for process in processes:
+        process.join()
+    station.unlink()
+
+if __name__ == "__main__":
+    main()
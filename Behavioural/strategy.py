@@ -1,5 +1,25 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+Price = Union[int, float, Decimal]
+
+def to_cents(price: Price) -> int:
+    """Convert a price in dollars to exact integer cents; sub-cent amounts round half up"""
+    if isinstance(price, int):
+        return price * 100
+    if isinstance(price, float):
+        # Any two-decimal float is within rounding error of a whole number of cents
+        cents = price * 100
+        nearest = round(cents)
+        if abs(cents - nearest) < 1e-6:
+            return nearest
+        # Otherwise round its shortest decimal form, the same way as a Decimal
+        price = Decimal(repr(price))
+    return int((price * 100).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+class RetryablePaymentError(Exception):
+    """Raised by pay() when the charge certainly did not go through, so trying again cannot charge twice"""
 
 # Strategy interface
 class PaymentStrategy(ABC):
@@ -42,17 +62,103 @@ class BankTransferPayment(PaymentStrategy):
 # Context
 class ShoppingCart:
     def __init__(self):
-        self._items: List[tuple[str, float]] = []
+        # Item name -> [unit price in cents, quantity]
+        self._items: Dict[str, List[int]] = {}
+        # Running total in cents, updated on every change so totals are O(1) and exact
+        self._total_cents = 0
         self._payment_strategy: Optional[PaymentStrategy] = None
     
-    def add_item(self, item: str, price: float) -> None:
-        self._items.append((item, price))
+    def add_item(self, item: str, price: Price, quantity: int = 1) -> None:
+        if quantity <= 0:
+            raise ValueError("Quantity must be positive")
+        cents = to_cents(price)
+        line = self._items.get(item)
+        if line is None:
+            self._items[item] = [cents, quantity]
+        elif line[0] != cents:
+            raise ValueError(f"{item} is already in the cart at a different price")
+        else:
+            line[1] += quantity
+        self._total_cents += cents * quantity
+    
+    def add_items(self, items: Iterable[Tuple]) -> None:
+        """Bulk add of (item, price) or (item, price, quantity) tuples"""
+        # Same rules as add_item(), inlined; the running total is updated once at the end
+        lines = self._items
+        added = 0
+        try:
+            for entry in items:
+                item, price = entry[0], entry[1]
+                quantity = entry[2] if len(entry) > 2 else 1
+                if quantity <= 0:
+                    raise ValueError("Quantity must be positive")
+                cents = to_cents(price)
+                line = lines.get(item)
+                if line is None:
+                    lines[item] = [cents, quantity]
+                elif line[0] != cents:
+                    raise ValueError(f"{item} is already in the cart at a different price")
+                else:
+                    line[1] += quantity
+                added += cents * quantity
+        finally:
+            self._total_cents += added
+    
+    def remove_item(self, item: str, quantity: Optional[int] = None) -> None:
+        """Remove quantity units of item, or the whole line when quantity is None"""
+        if quantity is not None and quantity <= 0:
+            raise ValueError("Quantity must be positive")
+        cents, held = self._items[item]
+        if quantity is None or quantity >= held:
+            del self._items[item]
+            quantity = held
+        else:
+            self._items[item][1] = held - quantity
+        self._total_cents -= cents * quantity
+    
+    def remove_items(self, items: Iterable[str]) -> None:
+        """Bulk removal of whole lines"""
+        lines = self._items
+        removed = 0
+        try:
+            for item in items:
+                cents, quantity = lines.pop(item)
+                removed += cents * quantity
+        finally:
+            self._total_cents -= removed
+    
+    def set_quantity(self, item: str, quantity: int) -> None:
+        if quantity <= 0:
+            self.remove_item(item)
+            return
+        line = self._items[item]
+        self._total_cents += line[0] * (quantity - line[1])
+        line[1] = quantity
+    
+    def quantity(self, item: str) -> int:
+        line = self._items.get(item)
+        return line[1] if line else 0
+    
+    def clear(self) -> None:
+        self._items.clear()
+        self._total_cents = 0
     
     def set_payment_strategy(self, strategy: PaymentStrategy) -> None:
         self._payment_strategy = strategy
     
+    @property
+    def payment_strategy(self) -> Optional[PaymentStrategy]:
+        return self._payment_strategy
+    
+    def __len__(self) -> int:
+        return len(self._items)
+    
+    @property
+    def total_cents(self) -> int:
+        return self._total_cents
+    
     def calculate_total(self) -> float:
-        return sum(price for _, price in self._items)
+        return self._total_cents / 100
     
     def checkout(self) -> bool:
         if not self._items:
@@ -66,13 +172,14 @@ class ShoppingCart:
         total = self.calculate_total()
         print("\nProcessing checkout...")
         print("Items:")
-        for item, price in self._items:
-            print(f"- {item}: ${price:.2f}")
+        for item, (cents, quantity) in self._items.items():
+            suffix = f" x{quantity}" if quantity > 1 else ""
+            print(f"- {item}: ${cents / 100:.2f}{suffix}")
         print(f"Total: ${total:.2f}")
         
         success = self._payment_strategy.pay(total)
         if success:
-            self._items.clear()
+            self.clear()
             print("Checkout completed successfully!")
         else:
             print("Checkout failed!")
@@ -110,6 +217,11 @@ def main():
     # Add another item
     cart.add_item("Headphones", 89.99)
     
+    # Quantities are tracked per line and the total stays exact
+    cart.add_item("USB Cable", 9.99, quantity=3)
+    cart.remove_item("USB Cable", quantity=1)
+    print(f"\nCart total with 2 USB cables: ${cart.calculate_total():.2f}")
+    
     # Checkout with Bank Transfer
     print("\nTrying Bank Transfer payment...")
     bank_transfer = BankTransferPayment("987654321", "BANKCODE123")
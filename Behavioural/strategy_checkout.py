@@ -0,0 +1,258 @@
+import asyncio
+import random
+import sys
+import time
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import zip_longest
+from typing import Deque, Dict, Iterable, List, Optional, Type
+
+from strategy import (BankTransferPayment, CreditCardPayment, PayPalPayment,
+                      PaymentStrategy, RetryablePaymentError, ShoppingCart)
+
+# Outcome of one cart's checkout
+class CheckoutResult:
+    def __init__(self, cart: ShoppingCart, strategy: str, amount_cents: int):
+        self.cart = cart
+        self.strategy = strategy
+        self.amount_cents = amount_cents
+        self.success = False
+        self.attempts = 0
+        self.error: Optional[str] = None
+        self.latency = 0.0
+
+# Aggregated outcome of a bulk checkout
+class CheckoutReport:
+    def __init__(self, results: List[CheckoutResult], elapsed: float):
+        self.results = results
+        self.elapsed = elapsed
+
+    @property
+    def succeeded(self) -> int:
+        return sum(result.success for result in self.results)
+
+    @property
+    def failed(self) -> int:
+        return len(self.results) - self.succeeded
+
+    def by_strategy(self) -> Dict[str, Dict[str, int]]:
+        """Per-strategy counts, collected cents and retry attempts"""
+        summary: Dict[str, Dict[str, int]] = defaultdict(lambda: {"succeeded": 0, "failed": 0, "cents": 0, "attempts": 0})
+        for result in self.results:
+            entry = summary[result.strategy]
+            entry["succeeded" if result.success else "failed"] += 1
+            entry["cents"] += result.amount_cents if result.success else 0
+            entry["attempts"] += result.attempts
+        return dict(summary)
+
+    def summary(self) -> str:
+        lines = [f"{len(self.results)} carts in {self.elapsed:.2f}s "
+                 f"({len(self.results) / self.elapsed:,.0f} carts/s): {self.succeeded} ok, {self.failed} failed"]
+        for strategy, entry in sorted(self.by_strategy().items()):
+            lines.append(f"  {strategy}: {entry['succeeded']} ok, {entry['failed']} failed, "
+                         f"${entry['cents'] / 100:,.2f} collected, {entry['attempts']} attempts")
+        return "\n".join(lines)
+
+# Bulk checkout engine
+class CheckoutEngine:
+    """
+    Checks out many carts concurrently, on a thread pool or with asyncio.
+    Carts are grouped by payment strategy class, and each group has its own
+    concurrency limit on top of the shared worker bound. A payment that
+    raises RetryablePaymentError is retried with exponential backoff and
+    jitter. Declines and any other exception end the checkout at once, since
+    pay() takes no idempotency key and a timed-out charge may have gone
+    through. Carts that are paid are cleared, as with checkout().
+    """
+    def __init__(self, max_workers: int = 32, limits: Optional[Dict[Type[PaymentStrategy], int]] = None,
+                 default_limit: int = 8, retries: int = 2, backoff: float = 0.01):
+        self._max_workers = max_workers
+        self._limits = limits or {}
+        self._default_limit = default_limit
+        self._retries = retries
+        self._backoff = backoff
+
+    def _limit_for(self, strategy_class: Type[PaymentStrategy]) -> int:
+        return self._limits.get(strategy_class, self._default_limit)
+
+    @staticmethod
+    def _group(carts: Iterable[ShoppingCart]) -> Dict[Type[PaymentStrategy], List[ShoppingCart]]:
+        groups: Dict[Type[PaymentStrategy], List[ShoppingCart]] = defaultdict(list)
+        for cart in carts:
+            groups[type(cart.payment_strategy)].append(cart)
+        return groups
+
+    @staticmethod
+    def _start(cart: ShoppingCart) -> CheckoutResult:
+        strategy = cart.payment_strategy
+        result = CheckoutResult(cart, type(strategy).__name__, cart.total_cents)
+        if strategy is None:
+            result.error = "No payment strategy"
+        elif not len(cart):
+            result.error = "Cart is empty"
+        return result
+
+    def _delay(self, attempt: int) -> float:
+        return self._backoff * (2 ** attempt) * random.uniform(0.5, 1.5)
+
+    def checkout_many(self, carts: Iterable[ShoppingCart]) -> CheckoutReport:
+        """
+        Each strategy group is drained by up to its limit of "lanes", each a
+        pool task paying one cart after another. Lanes are submitted round-robin
+        across groups, so no group can hold every worker while others wait.
+        """
+        start = time.perf_counter()
+        results: List[CheckoutResult] = []
+        lanes = []
+        for strategy_class, group in self._group(carts).items():
+            queue: Deque[CheckoutResult] = deque()
+            for cart in group:
+                result = self._start(cart)
+                results.append(result)
+                if result.error is None:
+                    queue.append(result)
+            lanes.append([queue] * min(self._limit_for(strategy_class), len(queue)))
+        with ThreadPoolExecutor(max_workers=self._max_workers) as pool:
+            futures = [pool.submit(self._drain, queue)
+                       for round_ in zip_longest(*lanes) for queue in round_ if queue is not None]
+            for future in futures:
+                future.result()
+        return CheckoutReport(results, time.perf_counter() - start)
+
+    def _drain(self, queue: Deque[CheckoutResult]) -> None:
+        while True:
+            try:
+                result = queue.popleft()
+            except IndexError:
+                return
+            self._pay(result)
+
+    def _pay(self, result: CheckoutResult) -> None:
+        strategy = result.cart.payment_strategy
+        amount = result.amount_cents / 100
+        begin = time.perf_counter()
+        for attempt in range(self._retries + 1):
+            result.attempts += 1
+            try:
+                result.success = strategy.pay(amount)
+                result.error = None if result.success else "Payment declined"
+            except RetryablePaymentError as error:
+                result.error = repr(error)
+                if attempt < self._retries:
+                    time.sleep(self._delay(attempt))
+                continue
+            except Exception as error:
+                result.error = repr(error)
+            if result.success:
+                result.cart.clear()
+            break
+        result.latency = time.perf_counter() - begin
+
+    async def checkout_many_async(self, carts: Iterable[ShoppingCart]) -> CheckoutReport:
+        """Same as checkout_many(), driven by asyncio; blocking pay() calls run on a bounded pool"""
+        start = time.perf_counter()
+        results: List[CheckoutResult] = []
+        tasks = []
+        with ThreadPoolExecutor(max_workers=self._max_workers) as pool:
+            for strategy_class, group in self._group(carts).items():
+                limit = asyncio.Semaphore(self._limit_for(strategy_class))
+                for cart in group:
+                    result = self._start(cart)
+                    results.append(result)
+                    if result.error is None:
+                        tasks.append(self._pay_async(result, limit, pool))
+            await asyncio.gather(*tasks)
+        return CheckoutReport(results, time.perf_counter() - start)
+
+    async def _pay_async(self, result: CheckoutResult, limit: asyncio.Semaphore,
+                         pool: ThreadPoolExecutor) -> None:
+        strategy = result.cart.payment_strategy
+        amount = result.amount_cents / 100
+        begin = time.perf_counter()
+        for attempt in range(self._retries + 1):
+            result.attempts += 1
+            async with limit:
+                retryable = False
+                try:
+                    loop = asyncio.get_running_loop()
+                    result.success = await loop.run_in_executor(pool, strategy.pay, amount)
+                    result.error = None if result.success else "Payment declined"
+                except RetryablePaymentError as error:
+                    result.error = repr(error)
+                    retryable = True
+                except Exception as error:
+                    result.error = repr(error)
+            if not retryable:
+                if result.success:
+                    result.cart.clear()
+                break
+            if attempt < self._retries:
+                await asyncio.sleep(self._delay(attempt))
+        result.latency = time.perf_counter() - begin
+
+# Simulated gateways for the benchmark
+class SimulatedPayment:
+    """
+    Mixin replacing pay() with a silent call that takes latency seconds,
+    occasionally spikes to spike_latency and sometimes fails. Failures are
+    refusals before any charge is made, so they are safe to retry.
+    """
+    latency = 0.01
+    failure_rate = 0.05
+    spike_rate = 0.0
+    spike_latency = 0.0
+
+    def pay(self, amount: float) -> bool:
+        time.sleep(self.spike_latency if random.random() < self.spike_rate else self.latency)
+        if random.random() < self.failure_rate:
+            raise RetryablePaymentError("Gateway busy")
+        return True
+
+class SimulatedCreditCardPayment(SimulatedPayment, CreditCardPayment):
+    latency = 0.008
+
+class SimulatedPayPalPayment(SimulatedPayment, PayPalPayment):
+    latency = 0.015
+
+class SimulatedBankTransferPayment(SimulatedPayment, BankTransferPayment):
+    latency = 0.03
+
+def make_carts(count: int) -> List[ShoppingCart]:
+    strategies = [SimulatedCreditCardPayment("1234-5678-9012-3456", "12/25", "123"),
+                  SimulatedPayPalPayment("user@example.com", "password123"),
+                  SimulatedBankTransferPayment("987654321", "BANKCODE123")]
+    carts = []
+    for i in range(count):
+        cart = ShoppingCart()
+        cart.add_item("Python Book", 49.99)
+        cart.add_item("Coffee Mug", 12.99, quantity=1 + i % 3)
+        cart.set_payment_strategy(strategies[i % len(strategies)])
+        carts.append(cart)
+    return carts
+
+def benchmark(count: int = 2000) -> None:
+    carts = make_carts(count // 10)
+    start = time.perf_counter()
+    for cart in carts:
+        try:
+            cart.payment_strategy.pay(cart.calculate_total())
+        except RetryablePaymentError:
+            pass
+    print(f"Sequential: {len(carts) / (time.perf_counter() - start):,.0f} carts/s")
+
+    limits = {SimulatedCreditCardPayment: 64, SimulatedPayPalPayment: 32, SimulatedBankTransferPayment: 32}
+    engine = CheckoutEngine(max_workers=128, limits=limits)
+    print("Thread pool:", engine.checkout_many(make_carts(count)).summary())
+    print("Asyncio:", asyncio.run(engine.checkout_many_async(make_carts(count))).summary())
+
+# Client code
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "--benchmark":
+        benchmark()
+        return
+
+    report = CheckoutEngine().checkout_many(make_carts(30))
+    print(report.summary())
+
+if __name__ == "__main__":
+    main()
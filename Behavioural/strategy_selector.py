@@ -0,0 +1,185 @@
+import random
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, List, Optional, Tuple
+
+from strategy import PaymentStrategy, ShoppingCart
+from strategy_checkout import (SimulatedBankTransferPayment,
+                               SimulatedCreditCardPayment,
+                               SimulatedPayPalPayment)
+
+# Moving-average health of one wrapped strategy
+class StrategyStats:
+    def __init__(self, alpha: float):
+        self._alpha = alpha
+        self.latency: Optional[float] = None  # EWMA of call latency in seconds
+        self.failure_rate = 0.0  # EWMA of failures (exceptions or declines)
+        self.calls = 0
+        self.failures = 0
+        self.hedges = 0
+        self.last_failure = 0.0
+
+    def record(self, latency: float, success: bool) -> None:
+        self.calls += 1
+        if self.latency is None:
+            self.latency = latency
+        else:
+            self.latency += self._alpha * (latency - self.latency)
+        self.failure_rate += self._alpha * ((0.0 if success else 1.0) - self.failure_rate)
+        if not success:
+            self.failures += 1
+            self.last_failure = time.monotonic()
+
+    def snapshot(self) -> Dict[str, float]:
+        return {"latency_ms": (self.latency or 0.0) * 1000, "failure_rate": self.failure_rate,
+                "calls": self.calls, "failures": self.failures, "hedges": self.hedges}
+
+# Concrete strategy that picks among other strategies
+class LatencyAwarePayment(PaymentStrategy):
+    """
+    Sends each payment to the healthy strategy with the lowest moving-average
+    latency. Strategies that have never been used are tried first, and a
+    fraction explore of payments goes to another healthy strategy so that
+    stale averages get refreshed. A strategy whose failure rate goes above
+    max_failure_rate is skipped until cooldown seconds after its last failure.
+
+    Hedging is off by default. With hedge=True, a payment still running after
+    latency_budget seconds is also sent to the next-best healthy strategy, and
+    the first success wins. The slower call cannot be cancelled, so both may
+    charge: only turn hedging on across gateways that deduplicate or void the
+    second charge.
+    """
+    def __init__(self, strategies: Dict[str, PaymentStrategy], latency_budget: float = 0.05,
+                 hedge: bool = False, alpha: float = 0.2, max_failure_rate: float = 0.5,
+                 cooldown: float = 5.0, explore: float = 0.05, max_workers: int = 32):
+        if not strategies:
+            raise ValueError("At least one strategy is required")
+        self._strategies = dict(strategies)
+        self._stats = {name: StrategyStats(alpha) for name in strategies}
+        self._latency_budget = latency_budget
+        self._hedge = hedge
+        self._max_failure_rate = max_failure_rate
+        self._cooldown = cooldown
+        self._explore = explore
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=max_workers) if hedge else None
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Current per-strategy numbers, e.g. for a dashboard"""
+        with self._lock:
+            return {name: stats.snapshot() for name, stats in self._stats.items()}
+
+    def ranked(self) -> List[str]:
+        """Strategy names, best first"""
+        return self._rank()[0]
+
+    def _rank(self) -> Tuple[List[str], int]:
+        now = time.monotonic()
+        with self._lock:
+            keys = {}
+            for name, stats in self._stats.items():
+                unhealthy = (stats.failure_rate > self._max_failure_rate
+                             and now - stats.last_failure < self._cooldown)
+                keys[name] = (unhealthy, stats.latency is not None, stats.latency or 0.0)
+        ranked = sorted(keys, key=keys.__getitem__)
+        return ranked, sum(not key[0] for key in keys.values())
+
+    def _call(self, name: str, amount: float) -> bool:
+        start = time.perf_counter()
+        try:
+            success = bool(self._strategies[name].pay(amount))
+        except Exception:
+            success = False
+        with self._lock:
+            self._stats[name].record(time.perf_counter() - start, success)
+        return success
+
+    def pay(self, amount: float) -> bool:
+        ranked, healthy = self._rank()
+        if healthy > 1 and random.random() < self._explore:
+            other = random.randrange(1, healthy)
+            ranked[0], ranked[other] = ranked[other], ranked[0]
+        # Never hedge to a strategy in cooldown; healthy ones are ranked first
+        if not self._hedge or healthy < 2:
+            return self._call(ranked[0], amount)
+
+        primary = self._pool.submit(self._call, ranked[0], amount)
+        done, _ = wait([primary], timeout=self._latency_budget)
+        if done and primary.result():
+            return True
+        # Over budget or failed: bring in the next-best strategy
+        with self._lock:
+            self._stats[ranked[1]].hedges += 1
+        pending = {primary, self._pool.submit(self._call, ranked[1], amount)} - done
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            if any(future.result() for future in done):
+                return True
+        return False
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+
+# Simulation
+def percentile(sorted_values: List[float], p: float) -> float:
+    return sorted_values[min(len(sorted_values) - 1, int(p / 100 * len(sorted_values)))]
+
+def simulate(strategy: PaymentStrategy, payments: int) -> str:
+    latencies = []
+    failures = 0
+    for _ in range(payments):
+        start = time.perf_counter()
+        try:
+            ok = strategy.pay(10.0)
+        except Exception:
+            ok = False
+        failures += not ok
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+    return (f"mean {sum(latencies) / payments * 1000:6.2f}ms, p99 {percentile(latencies, 99) * 1000:6.2f}ms, "
+            f"{failures} failures")
+
+def make_gateways() -> Dict[str, PaymentStrategy]:
+    card = SimulatedCreditCardPayment("1234-5678-9012-3456", "12/25", "123")
+    card.latency, card.spike_rate, card.spike_latency, card.failure_rate = 0.004, 0.05, 0.1, 0.02
+    paypal = SimulatedPayPalPayment("user@example.com", "password123")
+    paypal.latency, paypal.failure_rate = 0.008, 0.02
+    bank = SimulatedBankTransferPayment("987654321", "BANKCODE123")
+    bank.latency, bank.failure_rate = 0.002, 0.6
+    return {"credit_card": card, "paypal": paypal, "bank_transfer": bank}
+
+def benchmark(payments: int = 500) -> None:
+    gateways = make_gateways()
+    for name, gateway in gateways.items():
+        print(f"Fixed {name:>13}:  {simulate(gateway, payments)}")
+    # The simulated gateways move no money, so hedging is safe to compare here
+    for hedge in (False, True):
+        selector = LatencyAwarePayment(make_gateways(), latency_budget=0.015, hedge=hedge)
+        print(f"Selector hedge={hedge!s:5}: {simulate(selector, payments)}")
+        for name, stats in selector.stats().items():
+            print(f"    {name}: {stats}")
+        selector.close()
+
+# Client code
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "--benchmark":
+        benchmark()
+        return
+
+    selector = LatencyAwarePayment(make_gateways(), latency_budget=0.015)
+    cart = ShoppingCart()
+    cart.set_payment_strategy(selector)
+    for i in range(20):
+        cart.add_item("Coffee Mug", 12.99)
+        selector.pay(cart.calculate_total())
+        cart.clear()
+    print(f"Preferred order after 20 payments: {selector.ranked()}")
+    for name, stats in selector.stats().items():
+        print(f"{name}: {stats}")
+    selector.close()
+
+if __name__ == "__main__":
+    main()
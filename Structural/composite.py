@@ -1,11 +1,38 @@
+import sys
+import time
 from abc import ABC, abstractmethod
-from typing import List
+from fnmatch import fnmatchcase
+from typing import Dict, Iterator, List, Optional, TextIO, Tuple, Type, Union
 
 # Component interface
 class FileSystemComponent(ABC):
     def __init__(self, name: str):
+        self._parent: Optional["Directory"] = None
         self.name = name
     
+    @property
+    def name(self) -> str:
+        return self._name
+    
+    @name.setter
+    def name(self, value: str) -> None:
+        """Rename the component, re-keying it in its parent"""
+        parent = self._parent
+        if parent is None:
+            self._name = value
+            return
+        if value == self._name:
+            return
+        if value in parent._children:
+            raise ValueError(f"'{parent.name}' already contains '{value}'")
+        parent.remove(self)
+        self._name = value
+        parent.add(self)
+    
+    @property
+    def parent(self) -> Optional["Directory"]:
+        return self._parent
+    
     @abstractmethod
     def display(self, indent: str = "") -> None:
         pass
@@ -13,6 +40,54 @@ class FileSystemComponent(ABC):
     @abstractmethod
     def get_size(self) -> int:
         pass
+    
+    @abstractmethod
+    def describe(self) -> str:
+        """One-line description used when rendering the tree"""
+        pass
+    
+    def _iter_children(self) -> Iterator["FileSystemComponent"]:
+        return iter(())
+    
+    def walk(self, order: str = "pre", max_depth: Optional[int] = None,
+             kind: Union[Type["FileSystemComponent"], Tuple[Type["FileSystemComponent"], ...], None] = None
+             ) -> Iterator[Tuple[int, "FileSystemComponent"]]:
+        """
+        Iteratively yield (depth, component) pairs for this subtree.
+        order is "pre" or "post", max_depth stops descending below that depth
+        and kind only yields instances of the given type(s). An explicit stack
+        of child iterators is used so depth is not bounded by the recursion limit.
+        """
+        if order not in ("pre", "post"):
+            raise ValueError(f"Unknown traversal order: {order}")
+        pre = order == "pre"
+        
+        if pre and (kind is None or isinstance(self, kind)):
+            yield 0, self
+        stack = []
+        if max_depth is None or max_depth > 0:
+            stack.append((self, 0, self._iter_children()))
+        elif not pre and (kind is None or isinstance(self, kind)):
+            yield 0, self
+        
+        while stack:
+            node, depth, children = stack[-1]
+            child = next(children, None)
+            if child is None:
+                stack.pop()
+                if not pre and (kind is None or isinstance(node, kind)):
+                    yield depth, node
+                continue
+            
+            child_depth = depth + 1
+            matches = kind is None or isinstance(child, kind)
+            if pre and matches:
+                yield child_depth, child
+            # Leaves are pushed too; their empty child iterator pops them straight away
+            if max_depth is None or child_depth < max_depth:
+                stack.append((child, child_depth, child._iter_children()))
+            elif not pre and matches:
+                yield child_depth, child
 
 # Leaf
 class File(FileSystemComponent):
@@ -20,47 +95,200 @@ class File(FileSystemComponent):
         super().__init__(name)
         self._size = size
     
+    @property
+    def size(self) -> int:
+        return self._size
+    
+    @size.setter
+    def size(self, value: int) -> None:
+        """Resize the file and push the difference up to every ancestor"""
+        delta = value - self._size
+        self._size = value
+        if self._parent is not None and delta:
+            self._parent._propagate_size(delta)
+    
     def display(self, indent: str = "") -> None:
-        print(f"{indent}File: {self.name} ({self._size}KB)")
+        print(f"{indent}{self.describe()}")
+    
+    def describe(self) -> str:
+        return f"File: {self.name} ({self._size}KB)"
     
     def get_size(self) -> int:
         return self._size
 
 # Specialized Leaf classes
 class ImageFile(File):
-    def display(self, indent: str = "") -> None:
-        print(f"{indent}Image File: {self.name} ({self._size}KB)")
+    def describe(self) -> str:
+        return f"Image File: {self.name} ({self._size}KB)"
 
 class DocumentFile(File):
-    def display(self, indent: str = "") -> None:
-        print(f"{indent}Document File: {self.name} ({self._size}KB)")
+    def describe(self) -> str:
+        return f"Document File: {self.name} ({self._size}KB)"
 
 class ExecutableFile(File):
-    def display(self, indent: str = "") -> None:
-        print(f"{indent}Executable File: {self.name} ({self._size}KB)")
+    def describe(self) -> str:
+        return f"Executable File: {self.name} ({self._size}KB)"
 
 # Composite
 class Directory(FileSystemComponent):
     def __init__(self, name: str):
         super().__init__(name)
-        self._children: List[FileSystemComponent] = []
+        # Children keyed by name, so lookup and removal are O(1). Together
+        # these dicts form the tree's path index: a path resolves one dict
+        # lookup per segment, whatever the size of the tree
+        self._children: Dict[str, FileSystemComponent] = {}
+        # Cached aggregate size of the whole subtree, kept up to date
+        # incrementally so get_size() never has to walk the children
+        self._size = 0
     
     def add(self, component: FileSystemComponent) -> None:
-        self._children.append(component)
+        if component._parent is self:
+            return
+        if component is self:
+            raise ValueError(f"Cannot add '{component.name}' inside itself")
+        # Only a directory with children can contain this one
+        if isinstance(component, Directory) and component._children:
+            node = self._parent
+            while node is not None:
+                if node is component:
+                    raise ValueError(f"Cannot add '{component.name}' inside itself")
+                node = node._parent
+        if component.name in self._children:
+            raise ValueError(f"'{self.name}' already contains '{component.name}'")
+        
+        # Every check has passed; only now detach from the old parent
+        if component._parent is not None:
+            component._parent.remove(component)
+        self._children[component.name] = component
+        component._parent = self
+        self._propagate_size(component.get_size())
     
     def remove(self, component: FileSystemComponent) -> None:
-        self._children.remove(component)
+        if self._children.get(component.name) is not component:
+            raise ValueError(f"'{component.name}' is not in '{self.name}'")
+        del self._children[component.name]
+        component._parent = None
+        self._propagate_size(-component.get_size())
+    
+    def find(self, path: str) -> Optional[FileSystemComponent]:
+        """Look up a component by its path relative to this directory"""
+        node: FileSystemComponent = self
+        for segment in path.split("/"):
+            if not segment:
+                continue
+            if not isinstance(node, Directory):
+                return None
+            node = node._children.get(segment)
+            if node is None:
+                return None
+        return node
+    
+    def move(self, src: str, dst: str) -> FileSystemComponent:
+        """Move the component at src into the directory at dst"""
+        component = self.find(src)
+        if component is None or component is self:
+            raise ValueError(f"Cannot move '{src}'")
+        target = self.find(dst)
+        if not isinstance(target, Directory):
+            raise ValueError(f"'{dst}' is not a directory")
+        target.add(component)
+        return component
+    
+    def glob(self, pattern: str) -> List[FileSystemComponent]:
+        """
+        Match a path pattern segment by segment. Literal segments are direct
+        dictionary lookups; only wildcard segments scan a directory's names,
+        and "**" matches any number of nested directories.
+        """
+        matches: List[FileSystemComponent] = [self]
+        for segment in pattern.strip("/").split("/"):
+            found: Dict[int, FileSystemComponent] = {}
+            for directory in matches:
+                if not isinstance(directory, Directory):
+                    continue
+                if segment == "**":
+                    for _, node in directory.walk():
+                        found[id(node)] = node
+                elif any(c in segment for c in "*?["):
+                    for name, child in directory._children.items():
+                        if fnmatchcase(name, segment):
+                            found[id(child)] = child
+                elif segment in directory._children:
+                    child = directory._children[segment]
+                    found[id(child)] = child
+            matches = list(found.values())
+        return matches
+    
+    def _iter_children(self) -> Iterator[FileSystemComponent]:
+        return iter(self._children.values())
+    
+    def _propagate_size(self, delta: int) -> None:
+        """Apply a size change to this directory and all of its ancestors"""
+        if not delta:
+            return
+        node: Optional[Directory] = self
+        while node is not None:
+            node._size += delta
+            node = node._parent
     
     def display(self, indent: str = "") -> None:
-        print(f"{indent}Directory: {self.name} ({self.get_size()}KB)")
-        for child in self._children:
-            child.display(indent + "  ")
+        render(self, sys.stdout, indent)
+    
+    def describe(self) -> str:
+        return f"Directory: {self.name} ({self._size}KB)"
     
     def get_size(self) -> int:
-        return sum(child.get_size() for child in self._children)
+        return self._size
+
+# Renderer - writes a tree to any text sink without recursion
+def render(component: FileSystemComponent, sink: TextIO, indent: str = "",
+           max_depth: Optional[int] = None, chunk_size: int = 64 * 1024) -> None:
+    """Render the tree into sink, flushing lines in chunks of roughly chunk_size characters"""
+    buffer: List[str] = []
+    buffered = 0
+    for depth, node in component.walk(max_depth=max_depth):
+        line = f"{indent}{'  ' * depth}{node.describe()}\n"
+        buffer.append(line)
+        buffered += len(line)
+        if buffered >= chunk_size:
+            sink.write("".join(buffer))
+            buffer.clear()
+            buffered = 0
+    if buffer:
+        sink.write("".join(buffer))
+
+# Benchmark
+def benchmark(entries: int = 1_000_000) -> None:
+    root = Directory("root")
+    big = Directory("big")
+    root.add(big)
+    files = [File(f"file_{i}.dat", 1) for i in range(entries)]
+    
+    start = time.perf_counter()
+    for f in files:
+        big.add(f)
+    print(f"add:    {(time.perf_counter() - start) / entries * 1e6:.2f}us per entry")
+    
+    start = time.perf_counter()
+    for i in range(entries):
+        root.find(f"big/file_{i}.dat")
+    print(f"find:   {(time.perf_counter() - start) / entries * 1e6:.2f}us per lookup")
+    
+    start = time.perf_counter()
+    matches = big.glob("file_99999*.dat")
+    print(f"glob:   {time.perf_counter() - start:.3f}s for {len(matches)} matches")
+    
+    start = time.perf_counter()
+    for f in files:
+        big.remove(f)
+    print(f"remove: {(time.perf_counter() - start) / entries * 1e6:.2f}us per entry")
 
 # Client code
 def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "--benchmark":
+        benchmark()
+        return
+    
     # Create root directory
     root = Directory("root")
     
@@ -72,7 +300,8 @@ def main():
     # Create and populate Project directory
     project = Directory("Project")
     project.add(ExecutableFile("main.exe", 10))
-    project.add(DocumentFile("data.csv", 5000))
+    data_file = DocumentFile("data.csv", 5000)
+    project.add(data_file)
     
     # Add Project to Documents
     docs.add(project)
@@ -89,6 +318,24 @@ def main():
     root.display()
     
     print(f"\nTotal size: {root.get_size()}KB")
+    
+    # Resizing a file updates every ancestor's cached total
+    data_file.size = 6000
+    print(f"Total size after data.csv grows: {root.get_size()}KB")
+    
+    # Iterative traversal: every document, deepest first
+    print("\nDocuments (post-order):")
+    for depth, node in root.walk(order="post", kind=DocumentFile):
+        print(f"{depth}: {node.name}")
+    
+    # Path lookups, one dictionary lookup per segment
+    print(f"\nFind Documents/Project/main.exe: {root.find('Documents/Project/main.exe').describe()}")
+    print(f"Glob */*.jpg: {[node.name for node in root.glob('*/*.jpg')]}")
+    print(f"Glob **/*.csv: {[node.name for node in root.glob('**/*.csv')]}")
+    
+    # Moving a directory only re-links it; paths below it follow
+    root.move("Documents/Project", "")
+    print(f"After move, Project/data.csv found: {root.find('Project/data.csv') is data_file}")
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -0,0 +1,265 @@
+import sys
+import time
+import tracemalloc
+from array import array
+from itertools import accumulate
+from typing import Dict, Iterator, Optional, Type
+
+from composite import (Directory, DocumentFile, ExecutableFile, File,
+                       FileSystemComponent, ImageFile, render)
+
+# Node kinds stored in the kind column
+KIND_DIRECTORY = 0
+KIND_FILE = 1
+KIND_IMAGE = 2
+KIND_DOCUMENT = 3
+KIND_EXECUTABLE = 4
+
+KIND_LABELS = {
+    KIND_DIRECTORY: "Directory",
+    KIND_FILE: "File",
+    KIND_IMAGE: "Image File",
+    KIND_DOCUMENT: "Document File",
+    KIND_EXECUTABLE: "Executable File",
+}
+
+# Most specific class first so subclasses are matched before File
+KIND_OF_CLASS: Dict[Type[FileSystemComponent], int] = {
+    ImageFile: KIND_IMAGE,
+    DocumentFile: KIND_DOCUMENT,
+    ExecutableFile: KIND_EXECUTABLE,
+    File: KIND_FILE,
+    Directory: KIND_DIRECTORY,
+}
+
+def kind_of(component: FileSystemComponent) -> int:
+    # Views over stored trees already know their kind
+    kind = getattr(component, "kind", None)
+    if kind is not None:
+        return kind
+    for cls, kind in KIND_OF_CLASS.items():
+        if isinstance(component, cls):
+            return kind
+    raise TypeError(f"Unsupported component type: {type(component).__name__}")
+
+# Compact store - one row per node, each column a typed array
+class CompactTree:
+    """
+    Nodes are stored in pre-order: a directory's subtree is the contiguous
+    index range [index, end). That makes every subtree size a difference of
+    two entries in a prefix sum over the leaf sizes. Index columns are
+    32-bit, which limits a tree to 2G nodes and 4GB of names.
+    """
+    _OPEN = -1
+
+    def __init__(self):
+        self._name_data = bytearray()
+        self._name_offsets = array("I", [0])
+        self._sizes = array("q")
+        self._parents = array("i")
+        self._kinds = array("B")
+        self._ends = array("i")
+        self._open = []  # Directories whose subtree may still grow
+        self._prefix: Optional[array] = None
+        self._kind_prefix: Dict[int, array] = {}
+
+    def __len__(self) -> int:
+        return len(self._kinds)
+
+    # Building
+    def add_directory(self, name: str, parent: int = -1) -> int:
+        return self._append(name, 0, KIND_DIRECTORY, parent)
+
+    def add_file(self, name: str, size: int, parent: int, kind: int = KIND_FILE) -> int:
+        if kind == KIND_DIRECTORY:
+            raise ValueError("Use add_directory() for directories")
+        return self._append(name, size, kind, parent)
+
+    def _append(self, name: str, size: int, kind: int, parent: int) -> int:
+        index = len(self._kinds)
+        if parent == -1:
+            if index:
+                raise ValueError("Tree already has a root")
+        elif not (0 <= parent < index and self._kinds[parent] == KIND_DIRECTORY
+                  and self._ends[parent] == self._OPEN):
+            raise ValueError("Nodes must be appended in pre-order under an open directory")
+        # Appending under an ancestor closes every directory opened after it
+        while self._open and self._open[-1] != parent:
+            self._ends[self._open.pop()] = index
+
+        self._name_data += name.encode("utf-8")
+        self._name_offsets.append(len(self._name_data))
+        self._sizes.append(size)
+        self._parents.append(parent)
+        self._kinds.append(kind)
+        self._ends.append(self._OPEN if kind == KIND_DIRECTORY else index + 1)
+        if kind == KIND_DIRECTORY:
+            self._open.append(index)
+        self._invalidate()
+        return index
+
+    def set_size(self, index: int, size: int) -> None:
+        if self._kinds[index] == KIND_DIRECTORY:
+            raise ValueError("Directory sizes are derived from their contents")
+        self._sizes[index] = size
+        self._invalidate()
+
+    def _invalidate(self) -> None:
+        self._prefix = None
+        self._kind_prefix.clear()
+
+    @classmethod
+    def from_component(cls, root: FileSystemComponent) -> "CompactTree":
+        """Copy an object tree into the compact store"""
+        tree = cls()
+        path = []  # Index of the directory at each depth along the current branch
+        for depth, node in root.walk():
+            del path[depth:]
+            kind = kind_of(node)
+            parent = path[-1] if path else -1
+            if kind == KIND_DIRECTORY:
+                path.append(tree.add_directory(node.name, parent))
+            else:
+                tree.add_file(node.name, node.get_size(), parent, kind)
+        return tree
+
+    # Column access
+    def name_of(self, index: int) -> str:
+        start, end = self._name_offsets[index], self._name_offsets[index + 1]
+        return self._name_data[start:end].decode("utf-8")
+
+    def kind_of(self, index: int) -> int:
+        return self._kinds[index]
+
+    def parent_of(self, index: int) -> int:
+        return self._parents[index]
+
+    def end_of(self, index: int) -> int:
+        end = self._ends[index]
+        return len(self._kinds) if end == self._OPEN else end
+
+    def children_of(self, index: int) -> Iterator[int]:
+        child, end = index + 1, self.end_of(index)
+        while child < end:
+            yield child
+            child = self.end_of(child)
+
+    # Aggregates
+    def subtree_size(self, index: int = 0) -> int:
+        if self._prefix is None:
+            self._prefix = array("q", accumulate(self._sizes, initial=0))
+        return self._prefix[self.end_of(index)] - self._prefix[index]
+
+    def size_by_kind(self, index: int = 0) -> Dict[str, int]:
+        """Total leaf size per file kind within the subtree rooted at index"""
+        totals = {}
+        for kind in (KIND_FILE, KIND_IMAGE, KIND_DOCUMENT, KIND_EXECUTABLE):
+            prefix = self._kind_prefix.get(kind)
+            if prefix is None:
+                prefix = array("q", accumulate(
+                    (size if k == kind else 0 for size, k in zip(self._sizes, self._kinds)), initial=0))
+                self._kind_prefix[kind] = prefix
+            totals[KIND_LABELS[kind]] = prefix[self.end_of(index)] - prefix[index]
+        return totals
+
+    def nbytes(self) -> int:
+        """Approximate memory held by the columns"""
+        columns = (self._name_offsets, self._sizes, self._parents, self._kinds, self._ends)
+        return len(self._name_data) + sum(len(c) * c.itemsize for c in columns)
+
+    def root(self) -> "CompactNode":
+        if not self._kinds:
+            raise ValueError("Tree is empty")
+        return CompactNode(self, 0)
+
+# Flyweight view exposing one row through the FileSystemComponent API
+class CompactNode(FileSystemComponent):
+    def __init__(self, tree: CompactTree, index: int):
+        super().__init__(tree.name_of(index))
+        self._tree = tree
+        self._index = index
+
+    @property
+    def index(self) -> int:
+        return self._index
+
+    @property
+    def kind(self) -> int:
+        return self._tree.kind_of(self._index)
+
+    @property
+    def parent(self) -> Optional["CompactNode"]:
+        parent = self._tree.parent_of(self._index)
+        return None if parent < 0 else CompactNode(self._tree, parent)
+
+    def _iter_children(self) -> Iterator[FileSystemComponent]:
+        for child in self._tree.children_of(self._index):
+            yield CompactNode(self._tree, child)
+
+    def display(self, indent: str = "") -> None:
+        render(self, sys.stdout, indent)
+
+    def describe(self) -> str:
+        return f"{KIND_LABELS[self.kind]}: {self.name} ({self.get_size()}KB)"
+
+    def get_size(self) -> int:
+        return self._tree.subtree_size(self._index)
+
+# Benchmark
+def build_object_tree(dir_count: int, files_per_dir: int) -> Directory:
+    classes = [ImageFile, DocumentFile, ExecutableFile, File]
+    root = Directory("root")
+    for d in range(dir_count):
+        directory = Directory(f"dir_{d}")
+        for f in range(files_per_dir):
+            directory.add(classes[f % len(classes)](f"file_{f}", f % 1000))
+        root.add(directory)
+    return root
+
+def benchmark(dir_count: int = 1000, files_per_dir: int = 1000) -> None:
+    nodes = 1 + dir_count * (files_per_dir + 1)
+
+    tracemalloc.start()
+    objects = build_object_tree(dir_count, files_per_dir)
+    object_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    tracemalloc.start()
+    compact = CompactTree.from_component(objects)
+    compact_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    print(f"{nodes} nodes")
+    print(f"Object tree:  {object_bytes / nodes:.0f} bytes/node")
+    print(f"Compact tree: {compact_bytes / nodes:.0f} bytes/node ({compact.nbytes() / nodes:.0f} in columns)")
+
+    start = time.perf_counter()
+    total = compact.subtree_size()
+    by_kind = compact.size_by_kind()
+    print(f"Prefix sums: {time.perf_counter() - start:.3f}s, total {total}KB, {by_kind}")
+
+# Client code
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "--benchmark":
+        benchmark()
+        return
+
+    tree = CompactTree()
+    root = tree.add_directory("root")
+    docs = tree.add_directory("Documents", root)
+    tree.add_file("resume.pdf", 500, docs, KIND_DOCUMENT)
+    tree.add_file("photo.jpg", 2000, docs, KIND_IMAGE)
+    project = tree.add_directory("Project", docs)
+    tree.add_file("main.exe", 10, project, KIND_EXECUTABLE)
+    tree.add_file("data.csv", 5000, project, KIND_DOCUMENT)
+    tree.add_file("config.xml", 100, root, KIND_DOCUMENT)
+    tree.add_file("readme.txt", 50, root, KIND_DOCUMENT)
+
+    print("Compact File System Structure:")
+    tree.root().display()
+    print(f"\nTotal size: {tree.subtree_size()}KB")
+    print(f"Size by kind: {tree.size_by_kind()}")
+    print(f"Column memory: {tree.nbytes()} bytes for {len(tree)} nodes")
+
+if __name__ == "__main__":
+    main()
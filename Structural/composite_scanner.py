@@ -0,0 +1,107 @@
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Dict, List, Tuple, Type
+
+from composite import Directory, DocumentFile, ExecutableFile, File, ImageFile
+
+# Maps file extensions to the leaf class used to model them
+EXTENSION_TYPES: Dict[str, Type[File]] = {
+    ".jpg": ImageFile, ".jpeg": ImageFile, ".png": ImageFile,
+    ".gif": ImageFile, ".bmp": ImageFile, ".svg": ImageFile,
+    ".pdf": DocumentFile, ".txt": DocumentFile, ".doc": DocumentFile,
+    ".docx": DocumentFile, ".csv": DocumentFile, ".xml": DocumentFile,
+    ".md": DocumentFile, ".json": DocumentFile,
+    ".exe": ExecutableFile, ".bin": ExecutableFile, ".sh": ExecutableFile,
+    ".bat": ExecutableFile, ".so": ExecutableFile, ".dll": ExecutableFile,
+}
+
+def file_class_for(name: str) -> Type[File]:
+    """Pick the leaf class for a file name based on its extension"""
+    return EXTENSION_TYPES.get(os.path.splitext(name)[1].lower(), File)
+
+def _scan_one(path: str) -> Tuple[List[Tuple[str, int]], List[Tuple[str, str]]]:
+    """List one directory: (file name, size in KB) pairs and (name, path) of subdirectories"""
+    files: List[Tuple[str, int]] = []
+    subdirs: List[Tuple[str, str]] = []
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                try:
+                    # Symlinks are not followed so cyclic links cannot loop the scan
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append((entry.name, entry.path))
+                    elif entry.is_file(follow_symlinks=False):
+                        size = entry.stat(follow_symlinks=False).st_size
+                        files.append((entry.name, (size + 1023) // 1024))
+                except OSError:
+                    continue
+    except OSError:
+        # Unreadable directories show up empty instead of aborting the scan
+        pass
+    return files, subdirs
+
+# Scanner - builds a composite tree from a real directory
+class FileSystemScanner:
+    def __init__(self, workers: int = 8):
+        self._workers = workers
+
+    def scan(self, path: str) -> Directory:
+        """
+        Walk path with os.scandir on a thread pool. Worker threads only do the
+        I/O; nodes are streamed into the tree on the calling thread as each
+        directory listing completes, so the tree itself needs no locking.
+        """
+        root = Directory(os.path.basename(os.path.abspath(path)) or path)
+        with ThreadPoolExecutor(max_workers=self._workers) as pool:
+            pending: Dict[Future, Directory] = {pool.submit(_scan_one, path): root}
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    directory = pending.pop(future)
+                    files, subdirs = future.result()
+                    for name, size in files:
+                        directory.add(file_class_for(name)(name, size))
+                    for name, subpath in subdirs:
+                        child = Directory(name)
+                        directory.add(child)
+                        pending[pool.submit(_scan_one, subpath)] = child
+        return root
+
+# Benchmark
+def generate_tree(root: str, file_count: int, files_per_dir: int = 1000) -> None:
+    """Create file_count small files spread over directories of files_per_dir each"""
+    extensions = [".jpg", ".pdf", ".txt", ".exe", ".csv", ".dat"]
+    for i in range(file_count):
+        directory = os.path.join(root, f"dir_{i // files_per_dir // 100}", f"sub_{i // files_per_dir}")
+        if i % files_per_dir == 0:
+            os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, f"file_{i}{extensions[i % len(extensions)]}"), "wb") as f:
+            f.write(b"x" * (i % 4096))
+
+def benchmark(file_count: int = 1_000_000, worker_counts: Tuple[int, ...] = (1, 2, 4, 8, 16)) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"Generating {file_count} files...")
+        generate_tree(tmp, file_count)
+        for workers in worker_counts:
+            start = time.perf_counter()
+            tree = FileSystemScanner(workers).scan(tmp)
+            elapsed = time.perf_counter() - start
+            print(f"{workers:>3} workers: {elapsed:.2f}s "
+                  f"({file_count / elapsed:,.0f} files/s, {tree.get_size()}KB)")
+
+# Client code
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "--benchmark":
+        benchmark(int(sys.argv[2]) if len(sys.argv) > 2 else 1_000_000)
+        return
+
+    path = sys.argv[1] if len(sys.argv) > 1 else os.path.dirname(os.path.abspath(__file__))
+    tree = FileSystemScanner().scan(path)
+    print("Scanned File System Structure:")
+    tree.display()
+
+if __name__ == "__main__":
+    main()
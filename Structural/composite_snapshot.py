@@ -0,0 +1,217 @@
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import time
+from typing import Dict, Iterator, List, Optional, Tuple, Type
+
+from composite import (Directory, DocumentFile, ExecutableFile, File,
+                       FileSystemComponent, ImageFile, render)
+from composite_compact import (KIND_DIRECTORY, KIND_DOCUMENT, KIND_EXECUTABLE,
+                               KIND_FILE, KIND_IMAGE, KIND_LABELS, CompactTree,
+                               kind_of)
+
+# Snapshot layout:
+#   header     magic, node count, offset and length of the string table
+#   node table one fixed-width record per node, in pre-order
+#   strings    UTF-8 names, concatenated
+# A node's subtree is the record range [index, end), so children can be found
+# by hopping from one sibling's end to the next without any per-node pointers.
+MAGIC = b"FSSNAP01"
+HEADER = struct.Struct("<8sQQQ")
+# name offset, name length, kind, size (aggregate for directories), subtree end
+NODE = struct.Struct("<QIBxxxqQ")
+_END_OFFSET = 24
+
+CLASS_OF_KIND: Dict[int, Type[File]] = {
+    KIND_FILE: File,
+    KIND_IMAGE: ImageFile,
+    KIND_DOCUMENT: DocumentFile,
+    KIND_EXECUTABLE: ExecutableFile,
+}
+
+def save_snapshot(root: FileSystemComponent, path: str) -> int:
+    """Write the tree under root to path and return the number of nodes written"""
+    strings = bytearray()
+    nodes = bytearray()
+    open_dirs: List[Tuple[int, int]] = []  # (index, depth) of directories still being filled
+    count = 0
+    for depth, node in root.walk():
+        while open_dirs and open_dirs[-1][1] >= depth:
+            struct.pack_into("<Q", nodes, open_dirs.pop()[0] * NODE.size + _END_OFFSET, count)
+        name = node.name.encode("utf-8")
+        kind = kind_of(node)
+        nodes += NODE.pack(len(strings), len(name), kind, node.get_size(), count + 1)
+        strings += name
+        if kind == KIND_DIRECTORY:
+            open_dirs.append((count, depth))
+        count += 1
+    for index, _ in open_dirs:
+        struct.pack_into("<Q", nodes, index * NODE.size + _END_OFFSET, count)
+
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, count, HEADER.size + len(nodes), len(strings)))
+        f.write(nodes)
+        f.write(strings)
+    return count
+
+# Memory-mapped snapshot; nodes are only decoded when they are reached
+class Snapshot:
+    def __init__(self, path: str):
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"{path} is not a snapshot")
+        if len(self._map) < HEADER.size:
+            self.close()
+            raise ValueError(f"{path} is not a snapshot")
+        magic, self._count, self._strings_offset, strings_length = HEADER.unpack_from(self._map, 0)
+        if (magic != MAGIC or self._strings_offset != HEADER.size + self._count * NODE.size
+                or self._strings_offset + strings_length > len(self._map)):
+            self.close()
+            raise ValueError(f"{path} is not a snapshot")
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __enter__(self) -> "Snapshot":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._map.close()
+        self._file.close()
+
+    def _record(self, index: int) -> Tuple[int, int, int, int, int]:
+        return NODE.unpack_from(self._map, HEADER.size + index * NODE.size)
+
+    def _name(self, offset: int, length: int) -> str:
+        start = self._strings_offset + offset
+        return self._map[start:start + length].decode("utf-8")
+
+    def root(self) -> "SnapshotNode":
+        if not self._count:
+            raise ValueError("Snapshot is empty")
+        return SnapshotNode(self, 0)
+
+# Read-only view of one snapshot record
+class SnapshotNode(FileSystemComponent):
+    def __init__(self, snapshot: Snapshot, index: int):
+        name_offset, name_length, self._kind, self._size, self._end = snapshot._record(index)
+        super().__init__(snapshot._name(name_offset, name_length))
+        self._snapshot = snapshot
+        self._index = index
+
+    @property
+    def kind(self) -> int:
+        return self._kind
+
+    def _iter_children(self) -> Iterator[FileSystemComponent]:
+        child = self._index + 1
+        while child < self._end:
+            node = SnapshotNode(self._snapshot, child)
+            yield node
+            child = node._end
+
+    def child(self, name: str) -> Optional["SnapshotNode"]:
+        for node in self._iter_children():
+            if node.name == name:
+                return node
+        return None
+
+    def find(self, path: str) -> Optional["SnapshotNode"]:
+        """Resolve path one segment at a time, decoding only the siblings along the way"""
+        node: Optional[SnapshotNode] = self
+        for segment in path.strip("/").split("/"):
+            if segment and node is not None:
+                node = node.child(segment)
+        return node
+
+    def materialize(self) -> FileSystemComponent:
+        """Build real File/Directory objects for this subtree only"""
+        path: List[Directory] = []
+        top: Optional[FileSystemComponent] = None
+        for depth, node in self.walk():
+            del path[depth:]
+            if node._kind == KIND_DIRECTORY:
+                component = Directory(node.name)
+            else:
+                component = CLASS_OF_KIND[node._kind](node.name, node._size)
+            if path:
+                path[-1].add(component)
+            else:
+                top = component
+            if isinstance(component, Directory):
+                path.append(component)
+        return top
+
+    def display(self, indent: str = "") -> None:
+        render(self, sys.stdout, indent)
+
+    def describe(self) -> str:
+        return f"{KIND_LABELS[self._kind]}: {self.name} ({self._size}KB)"
+
+    def get_size(self) -> int:
+        return self._size
+
+# Benchmark
+def benchmark(dir_count: int = 10_000, files_per_dir: int = 1000) -> None:
+    tree = CompactTree()
+    root = tree.add_directory("root")
+    for d in range(dir_count):
+        directory = tree.add_directory(f"dir_{d}", root)
+        for f in range(files_per_dir):
+            tree.add_file(f"file_{f}", f % 1000, directory, KIND_FILE + f % 4)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "tree.snap")
+        start = time.perf_counter()
+        count = save_snapshot(tree.root(), path)
+        print(f"Saved {count} nodes in {time.perf_counter() - start:.1f}s "
+              f"({os.path.getsize(path) / 2**20:.0f}MB)")
+
+        start = time.perf_counter()
+        with Snapshot(path) as snapshot:
+            total = snapshot.root().get_size()
+            opened = time.perf_counter() - start
+            start = time.perf_counter()
+            subtree = snapshot.root().find(f"dir_{dir_count - 1}").materialize()
+            print(f"Open + root size: {opened * 1000:.2f}ms ({total}KB)")
+            print(f"Materialize one directory: {(time.perf_counter() - start) * 1000:.2f}ms "
+                  f"({subtree.get_size()}KB)")
+
+# Client code
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "--benchmark":
+        benchmark(int(sys.argv[2]) if len(sys.argv) > 2 else 10_000)
+        return
+
+    root = Directory("root")
+    docs = Directory("Documents")
+    docs.add(DocumentFile("resume.pdf", 500))
+    docs.add(ImageFile("photo.jpg", 2000))
+    project = Directory("Project")
+    project.add(ExecutableFile("main.exe", 10))
+    project.add(DocumentFile("data.csv", 5000))
+    docs.add(project)
+    root.add(docs)
+    root.add(DocumentFile("config.xml", 100))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "tree.snap")
+        save_snapshot(root, path)
+        with Snapshot(path) as snapshot:
+            print("Snapshot File System Structure:")
+            snapshot.root().display()
+
+            project_copy = snapshot.root().find("Documents/Project").materialize()
+            print("\nMaterialized Documents/Project only:")
+            project_copy.display()
+
+if __name__ == "__main__":
+    main()
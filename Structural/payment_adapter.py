@@ -1,5 +1,16 @@
+import os
+import sys
+import tempfile
+import threading
+import time
 from abc import ABC, abstractmethod
-from typing import Dict
+from typing import Callable, Iterable, List, Optional, Sequence, Tuple
+
+from payment_fx import FxRates, FxTable, write_rates
+from payment_ledger import CommitPolicy, Ledger, SQLiteLedger
+from payment_store import IdAllocator, StripedTransactionStore
+
+Payment = Tuple[float, str]  # (amount, currency)
 
 # Target Interface - defines how we want to process payments in our system
 class PaymentProcessor(ABC):
@@ -11,36 +22,59 @@ class PaymentProcessor(ABC):
     def refund(self, transaction_id: str) -> bool:
         pass
 
+    def process_payments(self, batch: Iterable[Payment]) -> List[bool]:
+        """Process many payments; results come back in the same order"""
+        return [self.process_payment(amount, currency) for amount, currency in batch]
+
+    def refund_many(self, transaction_ids: Iterable[str]) -> List[bool]:
+        """Refund many transactions; results come back in the same order"""
+        return [self.refund(transaction_id) for transaction_id in transaction_ids]
+
 # Adaptee - Third-party payment system with its own interface
 class ThirdPartyPayment:
-    """Modern payment system with different interface than what we need"""
-    def __init__(self):
-        self.transactions: Dict[str, float] = {}
-        self.counter = 0
+    """Modern payment system with different interface than what we need (safe to share between threads)"""
+    def __init__(self, ledger: Optional[Ledger] = None):
+        if ledger is None:
+            self.transactions = StripedTransactionStore()
+            self.ids = IdAllocator("TXN")
+        else:
+            self.transactions = ledger
+            self.ids = IdAllocator("TXN", start=ledger.high_water_mark(), on_reserve=ledger.set_high_water_mark)
     
     def create_payment(self, amount: float) -> str:
         """Initialize a new payment transaction"""
-        self.counter += 1
-        txn_id = f"TXN_{self.counter}"
+        txn_id = self.ids.next_id()
         self.transactions[txn_id] = amount
         return txn_id
+
+    def create_payments(self, amounts: Sequence[float]) -> List[str]:
+        """Initialize many payment transactions at once"""
+        txn_ids = self.ids.next_ids(len(amounts))
+        self.transactions.put_many(zip(txn_ids, amounts))
+        return txn_ids
     
     def execute(self, txn_id: str) -> bool:
         """Complete the payment transaction"""
         return txn_id in self.transactions
+
+    def execute_many(self, txn_ids: Iterable[str]) -> List[bool]:
+        """Complete many payment transactions at once"""
+        transactions = self.transactions
+        return [txn_id in transactions for txn_id in txn_ids]
     
     def reverse(self, txn_id: str) -> bool:
         """Cancel a payment transaction"""
-        if txn_id in self.transactions:
-            del self.transactions[txn_id]
-            return True
-        return False
+        return self.transactions.pop(txn_id, None) is not None
+
+    def reverse_many(self, txn_ids: Iterable[str]) -> List[bool]:
+        """Cancel many payment transactions at once"""
+        return self.transactions.pop_many(txn_ids)
 
 # Adapter - Makes ThirdPartyPayment work with PaymentProcessor interface
 class ThirdPartyAdapter(PaymentProcessor):
     """Adapts the third-party payment system to work with our interface"""
-    def __init__(self):
-        self.payment = ThirdPartyPayment()
+    def __init__(self, payment: Optional[ThirdPartyPayment] = None):
+        self.payment = ThirdPartyPayment() if payment is None else payment
     
     def process_payment(self, amount: float, currency: str) -> bool:
         """Adapt process_payment to use third-party's create and execute methods"""
@@ -51,43 +85,90 @@ class ThirdPartyAdapter(PaymentProcessor):
         """Adapt refund to use third-party's reverse method"""
         return self.payment.reverse(txn_id)
 
+    def process_payments(self, batch: Iterable[Payment]) -> List[bool]:
+        """Create the whole batch in one call, then execute it in one call"""
+        amounts = [amount for amount, _ in batch]
+        return self.payment.execute_many(self.payment.create_payments(amounts))
+
+    def refund_many(self, txn_ids: Iterable[str]) -> List[bool]:
+        return self.payment.reverse_many(txn_ids)
+
 # Adaptee - Legacy payment system with different interface
 class LegacyPayment:
-    """Old payment system with different interface than what we need"""
-    def __init__(self):
-        self.payments: Dict[str, float] = {}
-        self.count = 0
+    """Old payment system with different interface than what we need (safe to share between threads)"""
+    def __init__(self, ledger: Optional[Ledger] = None):
+        if ledger is None:
+            self.payments = StripedTransactionStore()
+            self.ids = IdAllocator("LEGACY")
+        else:
+            self.payments = ledger
+            self.ids = IdAllocator("LEGACY", start=ledger.high_water_mark(), on_reserve=ledger.set_high_water_mark)
     
     def pay(self, amount: float) -> str:
         """Process a payment with legacy system"""
-        self.count += 1
-        payment_id = f"LEGACY_{self.count}"
+        payment_id = self.ids.next_id()
         self.payments[payment_id] = amount
         return payment_id
+
+    def pay_many(self, amounts: Sequence[float]) -> List[str]:
+        """Process many payments with legacy system at once"""
+        payment_ids = self.ids.next_ids(len(amounts))
+        self.payments.put_many(zip(payment_ids, amounts))
+        return payment_ids
     
     def void(self, payment_id: str) -> bool:
         """Cancel a payment in legacy system"""
-        if payment_id in self.payments:
-            del self.payments[payment_id]
-            return True
-        return False
+        return self.payments.pop(payment_id, None) is not None
+
+    def void_many(self, payment_ids: Iterable[str]) -> List[bool]:
+        """Cancel many payments in legacy system at once"""
+        return self.payments.pop_many(payment_ids)
 
 # Adapter - Makes LegacyPayment work with PaymentProcessor interface
 class LegacyAdapter(PaymentProcessor):
-    """Adapts the legacy payment system to work with our interface"""
-    def __init__(self):
-        self.legacy = LegacyPayment()
+    """
+    Adapts the legacy payment system to work with our interface. The legacy
+    system only takes USD; with rates given, other currencies in the rate
+    table are converted to USD first. The rates must use USD as their base.
+    """
+    def __init__(self, legacy: Optional[LegacyPayment] = None, rates: Optional[FxRates] = None):
+        if rates is not None and rates.table.base != "USD":
+            raise ValueError(f"LegacyAdapter needs USD-based rates, got base {rates.table.base}")
+        self.legacy = LegacyPayment() if legacy is None else legacy
+        self.rates = rates
+
+    @staticmethod
+    def _to_usd(table: Optional[FxTable], amount: float, currency: str) -> Optional[float]:
+        if currency == "USD":
+            return amount
+        if table is None or currency not in table:
+            return None
+        return table.to_base(amount, currency)
+
+    def _table(self) -> Optional[FxTable]:
+        return None if self.rates is None else self.rates.table
     
     def process_payment(self, amount: float, currency: str) -> bool:
-        """Adapt process_payment to use legacy's pay method (USD only)"""
-        if currency != "USD":
+        """Adapt process_payment to use legacy's pay method (in USD)"""
+        usd = self._to_usd(self._table(), amount, currency)
+        if usd is None:
             return False
-        return bool(self.legacy.pay(amount))
+        return bool(self.legacy.pay(usd))
     
     def refund(self, txn_id: str) -> bool:
         """Adapt refund to use legacy's void method"""
         return self.legacy.void(txn_id)
 
+    def process_payments(self, batch: Iterable[Payment]) -> List[bool]:
+        """Pay every payable item in one call, all converted with the same rates; the rest fail in place"""
+        table = self._table()
+        amounts = [self._to_usd(table, amount, currency) for amount, currency in batch]
+        paid = iter(self.legacy.pay_many([usd for usd in amounts if usd is not None]))
+        return [usd is not None and bool(next(paid)) for usd in amounts]
+
+    def refund_many(self, txn_ids: Iterable[str]) -> List[bool]:
+        return self.legacy.void_many(txn_ids)
+
 # Client code
 def process_order(processor: PaymentProcessor, amount: float, currency: str):
     """Process an order using any payment processor that implements our interface"""
@@ -98,7 +179,135 @@ def process_order(processor: PaymentProcessor, amount: float, currency: str):
     else:
         print(f"Payment of {amount} {currency} failed")
 
+# Benchmark
+def benchmark(payments: int = 1_000_000, batch_size: int = 10_000) -> None:
+    batch = [(10.0 + i % 100, "USD") for i in range(batch_size)]
+    for name, factory in (("ThirdPartyAdapter", ThirdPartyAdapter), ("LegacyAdapter", LegacyAdapter)):
+        processor = factory()
+        start = time.perf_counter()
+        for _ in range(payments // batch_size):
+            for amount, currency in batch:
+                processor.process_payment(amount, currency)
+        per_call = payments / (time.perf_counter() - start)
+
+        processor = factory()
+        start = time.perf_counter()
+        for _ in range(payments // batch_size):
+            processor.process_payments(batch)
+        batched = payments / (time.perf_counter() - start)
+        print(f"{name}: per call {per_call:,.0f}/s, batched {batched:,.0f}/s ({batched / per_call:.1f}x)")
+
+def _create_and_reverse(create: Callable[[float], str], reverse: Callable[[str], bool],
+                        operations: int) -> List[str]:
+    created = [create(10.0) for _ in range(operations)]
+    for txn_id in created[::2]:
+        reverse(txn_id)
+    return created
+
+def benchmark_threads(operations: int = 200_000, thread_counts: Sequence[int] = (1, 2, 4, 8)) -> None:
+    """Concurrent create/reverse on one shared adaptee; checks IDs are unique and the store is consistent"""
+    for threads in thread_counts:
+        payment = ThirdPartyPayment()
+        per_thread = operations // threads
+        results: List[List[str]] = [[] for _ in range(threads)]
+
+        def worker(slot: int) -> None:
+            results[slot] = _create_and_reverse(payment.create_payment, payment.reverse, per_thread)
+
+        workers = [threading.Thread(target=worker, args=(slot,)) for slot in range(threads)]
+        start = time.perf_counter()
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+        created = [txn_id for result in results for txn_id in result]
+        unique = len(set(created)) == len(created)
+        consistent = len(payment.transactions) == sum(len(result[1::2]) for result in results)
+        print(f"{threads} threads: {len(created) * 1.5 / elapsed:,.0f} ops/s, "
+              f"unique IDs: {unique}, store consistent: {consistent}")
+
+def benchmark_ledger(payments: int = 20_000, threads: int = 32) -> None:
+    """
+    Durable payments per second from concurrent writers under different
+    commit policies. Each write waits for its commit, so grouping only pays
+    off when many threads (or one bulk call) write at once.
+    """
+    policies = {
+        "commit every write": CommitPolicy(batch=1, interval=None),
+        f"group of {threads} or 2ms": CommitPolicy(batch=threads, interval=0.002),
+        "group of 1000 or 10ms": CommitPolicy(batch=1000, interval=0.01),
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, policy in policies.items():
+            count = payments // 10 if policy.batch == 1 else payments
+            with SQLiteLedger(os.path.join(tmp, f"{policy.batch}.db"), policy) as ledger:
+                payment = ThirdPartyPayment(ledger)
+                per_thread = count // threads
+                workers = [threading.Thread(target=_create_and_reverse,
+                                            args=(payment.create_payment, payment.reverse, per_thread))
+                           for _ in range(threads)]
+                start = time.perf_counter()
+                for thread in workers:
+                    thread.start()
+                for thread in workers:
+                    thread.join()
+                elapsed = time.perf_counter() - start
+            print(f"{name:>22}, {threads} threads: {per_thread * threads * 1.5 / elapsed:,.0f} txn/s")
+
+        # One caller writing in bulk: each put_many/pop_many is one group
+        with SQLiteLedger(os.path.join(tmp, "bulk.db"), CommitPolicy(batch=1000, interval=0.01)) as ledger:
+            payment = ThirdPartyPayment(ledger)
+            start = time.perf_counter()
+            for _ in range(payments // 1000):
+                payment.reverse_many(payment.create_payments([10.0] * 1000)[::2])
+            elapsed = time.perf_counter() - start
+        print(f"{'bulk calls of 1000':>22}, 1 thread: {payments * 1.5 / elapsed:,.0f} txn/s")
+
+SAMPLE_RATES = {"USD": (2, "1"), "EUR": (2, "1.0842"), "GBP": (2, "1.2671"), "JPY": (0, "0.006712"),
+                "KWD": (3, "3.2547")}
+
+def benchmark_fx(conversions: int = 1_000_000) -> None:
+    """Per-payment conversion cost, with rates refreshed concurrently"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "rates.csv")
+        write_rates(path, SAMPLE_RATES)
+        rates = FxRates(path)
+        stop = threading.Event()
+
+        def refresher() -> None:
+            while not stop.wait(0.001):
+                write_rates(path, SAMPLE_RATES)
+                rates.refresh()
+
+        thread = threading.Thread(target=refresher)
+        thread.start()
+        start = time.perf_counter()
+        for i in range(conversions):
+            rates.table.convert(12345 + i, "EUR")
+        convert = (time.perf_counter() - start) / conversions
+        start = time.perf_counter()
+        for _ in range(conversions // 10):
+            rates.table.to_base(123.45, "EUR")
+        full = (time.perf_counter() - start) / (conversions // 10)
+        stop.set()
+        thread.join()
+        print(f"Minor-unit conversion: {convert * 1e9:.0f}ns, from float amount: {full * 1e9:.0f}ns "
+              f"(rates refreshed every 1ms meanwhile)")
+
 def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "--benchmark":
+        if sys.argv[2:] == ["threads"]:
+            benchmark_threads()
+        elif sys.argv[2:] == ["ledger"]:
+            benchmark_ledger()
+        elif sys.argv[2:] == ["fx"]:
+            benchmark_fx()
+        else:
+            benchmark()
+        return
+
     # Test both payment systems through the common interface
     third_party = ThirdPartyAdapter()
     legacy = LegacyAdapter()
@@ -109,5 +318,28 @@ def main():
     process_order(legacy, 50.00, "USD")  # Should succeed
     process_order(legacy, 200.00, "EUR")  # Should fail (USD only)
 
+    # Submit several payments at once; results keep the batch order
+    print(legacy.process_payments([(20.00, "USD"), (30.00, "EUR"), (40.00, "USD")]))
+    print(legacy.refund_many(["LEGACY_2", "LEGACY_9"]))
+
+    # Payments recorded in a ledger can still be refunded after a restart
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "ledger.db")
+        with SQLiteLedger(path) as ledger:
+            process_order(ThirdPartyAdapter(ThirdPartyPayment(ledger)), 80.00, "USD")
+        with SQLiteLedger(path) as ledger:
+            restarted = ThirdPartyAdapter(ThirdPartyPayment(ledger))
+            print(f"Refund after restart: {restarted.refund('TXN_1')}")
+            # Empty batches return straight away rather than waiting for a commit
+            print(restarted.process_payments([]), restarted.refund_many([]))
+
+        # With a rate table, the legacy system can take other currencies
+        rates_path = os.path.join(tmp, "rates.csv")
+        write_rates(rates_path, SAMPLE_RATES)
+        converting = LegacyAdapter(rates=FxRates(rates_path))
+        process_order(converting, 200.00, "EUR")  # Paid as 216.84 USD
+        process_order(converting, 50.00, "CHF")  # Should fail (no rate)
+        print(f"Legacy amounts in USD: {sorted(converting.legacy.payments.values())}")
+
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -0,0 +1,286 @@
+import asyncio
+import json
+import re
+import sys
+import time
+import uuid
+from abc import ABC, abstractmethod
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from payment_adapter import LegacyPayment, ThirdPartyPayment
+
+Response = Tuple[int, Dict]
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found"}
+
+# Stand-in gateway - the adaptees served over HTTP/1.1 with keep-alive
+class GatewayServer:
+    """
+    Serves ThirdPartyPayment and LegacyPayment as a small JSON-over-HTTP API.
+    latency simulates the network and processing time of a real gateway.
+    A request carrying an Idempotency-Key header is processed only once;
+    repeats with the same key, even while the first is still running, get
+    the first response. Responses are kept for the life of the server.
+    """
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency: float = 0.0):
+        self._host = host
+        self._port = port
+        self._latency = latency
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._responses: Dict[str, asyncio.Future] = {}
+        self._connections: Dict[asyncio.Task, asyncio.StreamWriter] = {}
+        self.third_party = ThirdPartyPayment()
+        self.legacy = LegacyPayment()
+        self.requests = 0
+        self._routes: List[Tuple[str, re.Pattern, Callable[..., Response]]] = [
+            ("POST", re.compile(r"/payments"), self._create),
+            ("POST", re.compile(r"/payments/([\w-]+)/execute"), self._execute),
+            ("POST", re.compile(r"/payments/([\w-]+)/reverse"), self._reverse),
+            ("POST", re.compile(r"/legacy/payments"), self._pay),
+            ("POST", re.compile(r"/legacy/payments/([\w-]+)/void"), self._void),
+        ]
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._serve, self._host, self._port, backlog=2048)
+
+    async def close(self) -> None:
+        self._server.close()
+        for writer in self._connections.values():
+            writer.close()
+        await asyncio.gather(*self._connections, return_exceptions=True)
+        await self._server.wait_closed()
+
+    def _create(self, body: Dict) -> Response:
+        return 200, {"txn_id": self.third_party.create_payment(body["amount"])}
+
+    def _execute(self, body: Dict, txn_id: str) -> Response:
+        return 200, {"ok": self.third_party.execute(txn_id)}
+
+    def _reverse(self, body: Dict, txn_id: str) -> Response:
+        return 200, {"ok": self.third_party.reverse(txn_id)}
+
+    def _pay(self, body: Dict) -> Response:
+        return 200, {"payment_id": self.legacy.pay(body["amount"])}
+
+    def _void(self, body: Dict, payment_id: str) -> Response:
+        return 200, {"ok": self.legacy.void(payment_id)}
+
+    async def _dispatch(self, method: str, path: str, body: Dict) -> Response:
+        if self._latency:
+            await asyncio.sleep(self._latency)
+        for route_method, pattern, handler in self._routes:
+            match = pattern.fullmatch(path)
+            if match and method == route_method:
+                try:
+                    return handler(body, *match.groups())
+                except (KeyError, TypeError) as error:
+                    return 400, {"error": repr(error)}
+        return 404, {"error": f"No route for {method} {path}"}
+
+    async def _respond(self, method: str, path: str, headers: Dict[str, str], body: Dict) -> Response:
+        key = headers.get("idempotency-key")
+        if key is None:
+            return await self._dispatch(method, path, body)
+        if key not in self._responses:
+            self._responses[key] = asyncio.ensure_future(self._dispatch(method, path, body))
+        return await asyncio.shield(self._responses[key])
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        task = asyncio.current_task()
+        self._connections[task] = writer
+        try:
+            while request_line := await reader.readline():
+                method, path, _ = request_line.decode().split(" ", 2)
+                headers = await read_headers(reader)
+                raw = await reader.readexactly(int(headers.get("content-length", 0)))
+                self.requests += 1
+                try:
+                    status, payload = await self._respond(method, path, headers, json.loads(raw) if raw else {})
+                except ValueError as error:
+                    status, payload = 400, {"error": repr(error)}
+                data = json.dumps(payload).encode()
+                writer.write(f"HTTP/1.1 {status} {REASONS[status]}\r\nContent-Type: application/json\r\n"
+                             f"Content-Length: {len(data)}\r\n\r\n".encode() + data)
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            del self._connections[task]
+            writer.close()
+
+async def read_headers(reader: asyncio.StreamReader) -> Dict[str, str]:
+    headers = {}
+    while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+        name, _, value = line.decode().partition(":")
+        headers[name.strip().lower()] = value.strip()
+    return headers
+
+# Client side - a bounded pool of keep-alive connections
+class ConnectionPool:
+    """
+    At most size connections to one host, reused across requests. A request
+    that times out or fails closes its connection rather than returning it,
+    since a late response would otherwise be read by the next request.
+    """
+    def __init__(self, host: str, port: int, size: int = 10, timeout: float = 5.0):
+        self._host = host
+        self._port = port
+        self._timeout = timeout
+        self._slots = asyncio.Semaphore(size)
+        self._idle: List[Tuple[asyncio.StreamReader, asyncio.StreamWriter]] = []
+        self.opened = 0
+
+    async def request(self, method: str, path: str, payload: Optional[Dict] = None,
+                      headers: Optional[Dict[str, str]] = None, timeout: Optional[float] = None) -> Response:
+        async with self._slots:
+            connection, response = await asyncio.wait_for(
+                self._exchange(self._idle.pop() if self._idle else None, method, path, payload, headers or {}),
+                self._timeout if timeout is None else timeout)
+            self._idle.append(connection)
+            return response
+
+    async def _exchange(self, connection, method: str, path: str, payload: Optional[Dict],
+                        headers: Dict[str, str]):
+        if connection is None:
+            connection = await asyncio.open_connection(self._host, self._port)
+            self.opened += 1
+        reader, writer = connection
+        body = json.dumps(payload).encode() if payload is not None else b""
+        head = "".join(f"{name}: {value}\r\n" for name, value in headers.items())
+        try:
+            writer.write(f"{method} {path} HTTP/1.1\r\nHost: {self._host}\r\nContent-Type: application/json\r\n"
+                         f"Content-Length: {len(body)}\r\n{head}\r\n".encode() + body)
+            await writer.drain()
+            status_line = await reader.readline()
+            if not status_line:
+                raise ConnectionError("Gateway closed the connection")
+            response_headers = await read_headers(reader)
+            data = await reader.readexactly(int(response_headers.get("content-length", 0)))
+        except BaseException:
+            writer.close()
+            raise
+        return connection, (int(status_line.split()[1]), json.loads(data) if data else {})
+
+    async def close(self) -> None:
+        while self._idle:
+            _, writer = self._idle.pop()
+            writer.close()
+
+# Async target interface
+class AsyncPaymentProcessor(ABC):
+    @abstractmethod
+    async def process_payment(self, amount: float, currency: str, idempotency_key: Optional[str] = None) -> bool:
+        pass
+
+    @abstractmethod
+    async def refund(self, transaction_id: str) -> bool:
+        pass
+
+class GatewayAdapter(AsyncPaymentProcessor):
+    """
+    Base for adapters that call the gateway. Each step is sent with an
+    idempotency key and retried on timeouts and dropped connections, so a
+    retry never charges twice. If every retry fails, the error is raised,
+    because the payment's outcome is then unknown rather than declined.
+    Pass the same idempotency_key when trying the payment again later.
+    """
+    def __init__(self, pool: ConnectionPool, retries: int = 2):
+        self._pool = pool
+        self._retries = retries
+
+    async def _call(self, path: str, payload: Optional[Dict], key: str) -> Response:
+        for attempt in range(self._retries + 1):
+            try:
+                return await self._pool.request("POST", path, payload, {"Idempotency-Key": key})
+            except (asyncio.TimeoutError, ConnectionError, asyncio.IncompleteReadError):
+                if attempt == self._retries:
+                    raise
+
+# Adapters - the same adaptation as ThirdPartyAdapter and LegacyAdapter, over the network
+class AsyncThirdPartyAdapter(GatewayAdapter):
+    async def process_payment(self, amount: float, currency: str, idempotency_key: Optional[str] = None) -> bool:
+        key = idempotency_key or uuid.uuid4().hex
+        status, body = await self._call("/payments", {"amount": amount, "currency": currency}, f"{key}:create")
+        if status != 200:
+            return False
+        status, body = await self._call(f"/payments/{body['txn_id']}/execute", None, f"{key}:execute")
+        return status == 200 and body["ok"]
+
+    async def refund(self, txn_id: str) -> bool:
+        status, body = await self._call(f"/payments/{txn_id}/reverse", None, f"reverse:{txn_id}")
+        return status == 200 and body["ok"]
+
+class AsyncLegacyAdapter(GatewayAdapter):
+    async def process_payment(self, amount: float, currency: str, idempotency_key: Optional[str] = None) -> bool:
+        if currency != "USD":
+            return False
+        key = idempotency_key or uuid.uuid4().hex
+        status, body = await self._call("/legacy/payments", {"amount": amount}, f"{key}:pay")
+        return status == 200 and bool(body["payment_id"])
+
+    async def refund(self, txn_id: str) -> bool:
+        status, body = await self._call(f"/legacy/payments/{txn_id}/void", None, f"void:{txn_id}")
+        return status == 200 and body["ok"]
+
+# Benchmark
+def percentile(sorted_values: List[float], p: float) -> float:
+    return sorted_values[min(len(sorted_values) - 1, int(p / 100 * len(sorted_values)))]
+
+async def timed(call: Awaitable[bool]) -> Tuple[bool, float]:
+    start = time.perf_counter()
+    ok = await call
+    return ok, time.perf_counter() - start
+
+async def benchmark(concurrency: int = 1000, pool_sizes: Tuple[int, ...] = (10, 50, 200),
+                    latency: float = 0.005) -> None:
+    server = GatewayServer(latency=latency)
+    await server.start()
+    host, port = server.address
+    for size in pool_sizes:
+        pool = ConnectionPool(host, port, size=size, timeout=10.0)
+        for name, adapter in (("third-party", AsyncThirdPartyAdapter(pool)), ("legacy", AsyncLegacyAdapter(pool))):
+            start = time.perf_counter()
+            results = await asyncio.gather(*(timed(adapter.process_payment(10.0, "USD"))
+                                             for _ in range(concurrency)))
+            elapsed = time.perf_counter() - start
+            latencies = sorted(latency for _, latency in results)
+            print(f"pool {size:>4}, {name:>11}: {concurrency} payments in {elapsed:.2f}s "
+                  f"({concurrency / elapsed:,.0f}/s), p50 {percentile(latencies, 50) * 1000:7.1f}ms, "
+                  f"p99 {percentile(latencies, 99) * 1000:7.1f}ms, {sum(ok for ok, _ in results)} ok")
+        print(f"pool {size:>4}: {pool.opened} connections opened")
+        await pool.close()
+    await server.close()
+
+# Client code
+async def demo() -> None:
+    server = GatewayServer(latency=0.001)
+    await server.start()
+    pool = ConnectionPool(*server.address, size=4, timeout=1.0)
+    third_party = AsyncThirdPartyAdapter(pool)
+    legacy = AsyncLegacyAdapter(pool)
+
+    print(await asyncio.gather(third_party.process_payment(75.50, "USD"),
+                               third_party.process_payment(150.00, "EUR"),
+                               legacy.process_payment(50.00, "USD"),
+                               legacy.process_payment(200.00, "EUR")))
+
+    # Retrying with the same key does not charge twice
+    await legacy.process_payment(20.00, "USD", idempotency_key="order-42")
+    await legacy.process_payment(20.00, "USD", idempotency_key="order-42")
+    print(f"Legacy payments recorded: {len(server.legacy.payments)}")
+    print(f"Refund TXN_1: {await third_party.refund('TXN_1')}")
+    print(f"{server.requests} requests over {pool.opened} connections")
+    await pool.close()
+    await server.close()
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "--benchmark":
+        asyncio.run(benchmark())
+        return
+    asyncio.run(demo())
+
+if __name__ == "__main__":
+    main()
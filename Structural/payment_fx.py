@@ -0,0 +1,116 @@
+import os
+import threading
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
+from fractions import Fraction
+from typing import Dict, Iterable, Optional, Tuple
+
+# Rate file format, one currency per line (blank lines and # comments ignored):
+#   currency,minor_unit_exponent,rate
+# where rate is the value of one major unit in the base currency, e.g.
+#   USD,2,1
+#   EUR,2,1.0842
+#   JPY,0,0.006712
+# The base currency must be listed with rate 1.
+
+# Immutable rate table
+class FxTable:
+    """
+    Converts amounts in integer minor units to the base currency, exactly.
+    Each rate is stored as one reduced fraction that already includes both
+    currencies' minor-unit exponents. A conversion is then one dict lookup,
+    one multiplication and one division, rounded half up. A table never
+    changes once built; refreshing means building a new one.
+    """
+    __slots__ = ("base", "_rates", "_exponents")
+
+    def __init__(self, rows: Iterable[Tuple[str, int, Decimal]], base: str = "USD"):
+        rows = list(rows)
+        exponents = {currency: exponent for currency, exponent, _ in rows}
+        if base not in exponents:
+            raise ValueError(f"Rate table has no entry for base currency {base}")
+        rates: Dict[str, Tuple[int, int]] = {}
+        for currency, exponent, rate in rows:
+            if rate <= 0:
+                raise ValueError(f"Rate for {currency} must be positive")
+            ratio = Fraction(rate) * 10 ** exponents[base] / 10 ** exponent
+            rates[currency] = (ratio.numerator, ratio.denominator)
+        self.base = base
+        self._rates = rates
+        self._exponents = exponents
+
+    @classmethod
+    def load(cls, path: str, base: str = "USD") -> "FxTable":
+        rows = []
+        with open(path, encoding="utf-8") as file:
+            for number, line in enumerate(file, 1):
+                line = line.split("#", 1)[0].strip()
+                if not line:
+                    continue
+                try:
+                    currency, exponent, rate = (field.strip() for field in line.split(","))
+                    rows.append((currency.upper(), int(exponent), Decimal(rate)))
+                except (ValueError, InvalidOperation):
+                    raise ValueError(f"{path}:{number}: expected currency,exponent,rate") from None
+        return cls(rows, base)
+
+    def __contains__(self, currency: str) -> bool:
+        return currency in self._rates
+
+    def __len__(self) -> int:
+        return len(self._rates)
+
+    def exponent(self, currency: str) -> int:
+        return self._exponents[currency]
+
+    def convert(self, amount_minor: int, currency: str) -> int:
+        """Minor units of currency to minor units of the base currency"""
+        numerator, denominator = self._rates[currency]
+        quotient, remainder = divmod(amount_minor * numerator, denominator)
+        return quotient + (2 * remainder >= denominator)
+
+    def to_minor(self, amount: float, currency: str) -> int:
+        """A major-unit amount in minor units, using its shortest decimal form"""
+        return int(Decimal(repr(amount)).scaleb(self._exponents[currency]).to_integral_value(ROUND_HALF_UP))
+
+    def to_base(self, amount: float, currency: str) -> float:
+        """A major-unit amount converted to major units of the base currency"""
+        return self.convert(self.to_minor(amount, currency), currency) / 10 ** self._exponents[self.base]
+
+# Refreshable holder
+class FxRates:
+    """
+    Holds the current FxTable. refresh() builds a complete new table from the
+    file and then swaps one reference. Readers take that reference without
+    locking and always see either the old table or the new one, never a mix.
+    A file that fails to parse leaves the current table in place.
+    """
+    def __init__(self, path: str, base: str = "USD"):
+        self._path = path
+        self._base = base
+        self._lock = threading.Lock()  # serializes refreshes only
+        self._mtime: Optional[int] = None
+        self.table = FxTable.load(path, base)
+        self._mtime = os.stat(path).st_mtime_ns
+
+    def refresh(self) -> FxTable:
+        with self._lock:
+            mtime = os.stat(self._path).st_mtime_ns
+            self.table = FxTable.load(self._path, self._base)
+            self._mtime = mtime
+            return self.table
+
+    def refresh_if_changed(self) -> bool:
+        if os.stat(self._path).st_mtime_ns == self._mtime:
+            return False
+        self.refresh()
+        return True
+
+def write_rates(path: str, rates: Dict[str, Tuple[int, str]]) -> None:
+    """Write a rate file atomically: readers of path see the old file or the new one"""
+    temporary = f"{path}.tmp"
+    with open(temporary, "w", encoding="utf-8") as file:
+        for currency, (exponent, rate) in rates.items():
+            file.write(f"{currency},{exponent},{rate}\n")
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temporary, path)
@@ -0,0 +1,227 @@
+import sqlite3
+import threading
+from abc import abstractmethod
+from collections.abc import MutableMapping
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+# Ledger interface - a transaction store that survives restarts
+class Ledger(MutableMapping):
+    """
+    Maps transaction IDs to amounts, like StripedTransactionStore, but keeps
+    them across restarts. It also remembers the ID high-water mark, so a
+    restarted adaptee never hands out an ID that was used before.
+    """
+    @abstractmethod
+    def put_many(self, items: Iterable[Tuple[str, float]]) -> None:
+        pass
+
+    @abstractmethod
+    def pop_many(self, keys: Iterable[str]) -> List[bool]:
+        """Remove each key; True where it was present, in input order"""
+        pass
+
+    @abstractmethod
+    def high_water_mark(self) -> int:
+        """First ID number that has never been reserved"""
+        pass
+
+    @abstractmethod
+    def set_high_water_mark(self, mark: int) -> None:
+        """Persist mark durably before returning, since IDs below it are handed out next"""
+        pass
+
+    def flush(self) -> None:
+        """Make every write so far durable"""
+        pass
+
+    def close(self) -> None:
+        self.flush()
+
+    def __enter__(self) -> "Ledger":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+# When buffered writes become durable
+class CommitPolicy:
+    """
+    Commit once batch writes are buffered, and at least every interval
+    seconds while any are. Every write still waits for the commit of its
+    group before it returns, so nothing is reported done before it is
+    durable. A larger batch lets writes from many threads share one fsync,
+    at the cost of up to interval seconds of extra latency per write.
+    batch=1 commits each write on its own and needs no interval.
+    """
+    def __init__(self, batch: int = 32, interval: Optional[float] = 0.002):
+        if batch < 1:
+            raise ValueError("batch must be at least 1")
+        if batch > 1 and interval is None:
+            raise ValueError("batch above 1 needs an interval to commit partial groups")
+        self.batch = batch
+        self.interval = interval
+
+    def __repr__(self) -> str:
+        return f"CommitPolicy(batch={self.batch}, interval={self.interval})"
+
+# Default backend - SQLite in WAL mode with group commit
+class SQLiteLedger(Ledger):
+    """
+    Transactions live in a WITHOUT ROWID table keyed by ID, so reverse() and
+    void() are a single primary-key lookup. Writes go into an open SQLite
+    transaction that is committed according to the policy, and each writer
+    then waits until that commit has happened. Each commit fsyncs the WAL
+    (synchronous=FULL). Reads use the same connection, so they also see
+    other threads' writes that are still waiting for their commit. One
+    connection is shared behind a lock, which makes the ledger safe to use
+    from many threads. The ID high-water mark is committed immediately.
+    """
+    def __init__(self, path: str, policy: Optional[CommitPolicy] = None, table: str = "transactions"):
+        if not table.isidentifier():
+            raise ValueError(f"Invalid table name: {table}")
+        self._policy = policy or CommitPolicy()
+        self._table = table
+        self._lock = threading.RLock()
+        self._committed = threading.Condition(self._lock)
+        self._pending = 0
+        # Writes join the open group; groups are numbered and committed in order
+        self._group = 1
+        self._durable = 0
+        self._failed_groups = set()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=FULL")
+        self._conn.execute(f"CREATE TABLE IF NOT EXISTS {table} "
+                           "(txn_id TEXT PRIMARY KEY, amount REAL NOT NULL) WITHOUT ROWID")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS ledger_meta (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+        self._closed = threading.Event()
+        self._flusher = None
+        if self._policy.interval is not None and self._policy.batch > 1:
+            self._flusher = threading.Thread(target=self._flush_periodically, daemon=True)
+            self._flusher.start()
+
+    def _query(self, sql: str, params: Tuple = ()) -> Optional[Tuple]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchone()
+
+    def _begin(self) -> None:
+        if not self._conn.in_transaction:
+            self._conn.execute("BEGIN")
+
+    def _write(self, sql: str, params: Tuple = ()) -> List[Tuple]:
+        """Run one statement inside the open group; returns its rows (for RETURNING) once committed"""
+        with self._lock:
+            self._begin()
+            rows = self._conn.execute(sql, params).fetchall()
+            self._written(1)
+            return rows
+
+    def _written(self, count: int) -> None:
+        """Add count writes to the open group and wait for its commit; caller holds the lock"""
+        if count == 0:
+            return  # nothing joined the group, so nothing would ever commit it
+        group = self._group
+        self._pending += count
+        if self._pending >= self._policy.batch:
+            self._commit()
+        # Waiting releases the lock, so other writers can join the group meanwhile
+        while self._durable < group:
+            self._committed.wait()
+        if group in self._failed_groups:
+            raise sqlite3.OperationalError(f"Commit of write group {group} failed; its writes were rolled back")
+
+    def _commit(self) -> None:
+        group = self._group
+        self._group += 1
+        self._pending = 0
+        try:
+            if self._conn.in_transaction:
+                self._conn.execute("COMMIT")
+        except sqlite3.Error:
+            self._failed_groups.add(group)
+            if self._conn.in_transaction:
+                self._conn.execute("ROLLBACK")
+            raise
+        finally:
+            self._durable = group
+            self._committed.notify_all()
+
+    def _flush_periodically(self) -> None:
+        while not self._closed.wait(self._policy.interval):
+            try:
+                self.flush()
+            except sqlite3.Error:
+                pass  # the writers in the failed group get the error
+
+    def flush(self) -> None:
+        with self._lock:
+            if self._pending:
+                self._commit()
+
+    def close(self) -> None:
+        self._closed.set()
+        if self._flusher is not None:
+            self._flusher.join()
+        with self._lock:
+            self._commit()
+            self._conn.close()
+
+    def __getitem__(self, key: str) -> float:
+        row = self._query(f"SELECT amount FROM {self._table} WHERE txn_id = ?", (key,))
+        if row is None:
+            raise KeyError(key)
+        return row[0]
+
+    def __contains__(self, key: object) -> bool:
+        return self._query(f"SELECT 1 FROM {self._table} WHERE txn_id = ?", (key,)) is not None
+
+    def __setitem__(self, key: str, amount: float) -> None:
+        self._write(f"INSERT OR REPLACE INTO {self._table} VALUES (?, ?)", (key, amount))
+
+    def __delitem__(self, key: str) -> None:
+        if not self._write(f"DELETE FROM {self._table} WHERE txn_id = ? RETURNING 1", (key,)):
+            raise KeyError(key)
+
+    def __len__(self) -> int:
+        return self._query(f"SELECT COUNT(*) FROM {self._table}")[0]
+
+    def __iter__(self) -> Iterator[str]:
+        with self._lock:
+            keys = [row[0] for row in self._conn.execute(f"SELECT txn_id FROM {self._table}")]
+        return iter(keys)
+
+    _MISSING = object()
+
+    def pop(self, key: str, default=_MISSING):
+        rows = self._write(f"DELETE FROM {self._table} WHERE txn_id = ? RETURNING amount", (key,))
+        if rows:
+            return rows[0][0]
+        if default is self._MISSING:
+            raise KeyError(key)
+        return default
+
+    def put_many(self, items: Iterable[Tuple[str, float]]) -> None:
+        items = list(items)
+        with self._lock:
+            self._begin()
+            self._conn.executemany(f"INSERT OR REPLACE INTO {self._table} VALUES (?, ?)", items)
+            self._written(len(items))
+
+    def pop_many(self, keys: Iterable[str]) -> List[bool]:
+        sql = f"DELETE FROM {self._table} WHERE txn_id = ?"
+        with self._lock:
+            self._begin()
+            removed = [self._conn.execute(sql, (key,)).rowcount > 0 for key in keys]
+            self._written(len(removed))
+        return removed
+
+    def high_water_mark(self) -> int:
+        row = self._query("SELECT value FROM ledger_meta WHERE name = ?", (self._table,))
+        return 1 if row is None else row[0]
+
+    def set_high_water_mark(self, mark: int) -> None:
+        """Commits straight away, with any writes already in the open group, before returning"""
+        with self._lock:
+            self._begin()
+            self._conn.execute("INSERT OR REPLACE INTO ledger_meta VALUES (?, ?)", (self._table, mark))
+            self._commit()
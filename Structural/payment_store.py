@@ -0,0 +1,138 @@
+import threading
+from collections.abc import MutableMapping
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# ID allocation - threads reserve blocks of numbers and hand them out without locking
+class IdAllocator:
+    """
+    Unique IDs of the form prefix_n. A thread takes a block of block_size
+    numbers from the shared counter under a lock, then hands them out with
+    no further locking. IDs never repeat, but they only increase within a
+    thread, not across threads. on_reserve, if given, is called with the new
+    high-water mark whenever numbers are reserved, so it can be persisted.
+    None of the reserved numbers are handed out until it returns, and if it
+    raises they are not reserved at all.
+    """
+    def __init__(self, prefix: str, block_size: int = 1024, start: int = 1,
+                 on_reserve: Optional[Callable[[int], None]] = None):
+        self._prefix = prefix
+        self._block_size = block_size
+        self._next = start
+        self._on_reserve = on_reserve
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _reserve(self, count: int) -> int:
+        with self._lock:
+            first = self._next
+            if self._on_reserve is not None:
+                self._on_reserve(first + count)
+            self._next = first + count
+        return first
+
+    def next_id(self) -> str:
+        local = self._local
+        try:
+            n = local.next
+        except AttributeError:
+            n = local.end = 0
+        if n == local.end:
+            n = self._reserve(self._block_size)
+            local.end = n + self._block_size
+        local.next = n + 1
+        return f"{self._prefix}_{n}"
+
+    def next_ids(self, count: int) -> List[str]:
+        """A contiguous run of count IDs, for bulk operations"""
+        local = self._local
+        n, end = getattr(local, "next", 0), getattr(local, "end", 0)
+        if end - n >= count:
+            local.next = n + count
+        elif count < self._block_size:
+            n = self._reserve(self._block_size)
+            local.next, local.end = n + count, n + self._block_size
+        else:
+            n = self._reserve(count)
+        prefix = self._prefix
+        return [f"{prefix}_{i}" for i in range(n, n + count)]
+
+# Transaction store - a dict split into independently locked stripes
+class StripedTransactionStore(MutableMapping):
+    """
+    Maps transaction IDs to amounts. Keys are spread over stripes that each
+    have their own lock, so threads working on different transactions rarely
+    wait for each other. Every single operation, including pop, is atomic, so
+    a transaction can be reversed exactly once however many threads try.
+    """
+    def __init__(self, stripes: int = 64):
+        if stripes < 1 or stripes & (stripes - 1):
+            raise ValueError("stripes must be a power of two")
+        self._mask = stripes - 1
+        self._stripes: List[Dict[str, float]] = [{} for _ in range(stripes)]
+        self._locks = [threading.Lock() for _ in range(stripes)]
+
+    def __getitem__(self, key: str) -> float:
+        i = hash(key) & self._mask
+        with self._locks[i]:
+            return self._stripes[i][key]
+
+    def __setitem__(self, key: str, amount: float) -> None:
+        i = hash(key) & self._mask
+        with self._locks[i]:
+            self._stripes[i][key] = amount
+
+    def __delitem__(self, key: str) -> None:
+        i = hash(key) & self._mask
+        with self._locks[i]:
+            del self._stripes[i][key]
+
+    def __contains__(self, key: object) -> bool:
+        i = hash(key) & self._mask
+        with self._locks[i]:
+            return key in self._stripes[i]
+
+    def __len__(self) -> int:
+        return sum(len(stripe) for stripe in self._stripes)
+
+    def __iter__(self) -> Iterator[str]:
+        for lock, stripe in zip(self._locks, self._stripes):
+            with lock:
+                keys = list(stripe)
+            yield from keys
+
+    _MISSING = object()
+
+    def pop(self, key: str, default=_MISSING):
+        i = hash(key) & self._mask
+        with self._locks[i]:
+            if default is self._MISSING:
+                return self._stripes[i].pop(key)
+            return self._stripes[i].pop(key, default)
+
+    def _by_stripe(self, keys: Iterable[str]) -> Dict[int, List[int]]:
+        """Positions of keys grouped by stripe, so each lock is taken once per batch"""
+        groups: Dict[int, List[int]] = {}
+        mask = self._mask
+        for position, key in enumerate(keys):
+            groups.setdefault(hash(key) & mask, []).append(position)
+        return groups
+
+    def put_many(self, items: Iterable[Tuple[str, float]]) -> None:
+        items = list(items)
+        for i, positions in self._by_stripe(key for key, _ in items).items():
+            stripe = self._stripes[i]
+            with self._locks[i]:
+                for position in positions:
+                    key, amount = items[position]
+                    stripe[key] = amount
+
+    def pop_many(self, keys: Iterable[str]) -> List[bool]:
+        """Remove each key; True where it was present, in input order"""
+        keys = list(keys)
+        removed = [False] * len(keys)
+        for i, positions in self._by_stripe(keys).items():
+            pop = self._stripes[i].pop
+            with self._locks[i]:
+                for position in positions:
+                    removed[position] = pop(keys[position], self._MISSING) is not self._MISSING
+        return removed